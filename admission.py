@@ -0,0 +1,236 @@
+"""
+Fair-queueing admission control for A2A task managers.
+Mitigates: DoS, Insider Threats
+MAESTRO Layers: 4 (Deployment & Infrastructure), 3 (Agent Frameworks)
+
+Instead of failing a request as soon as a user goes over the rate limit, the
+scheduler queues it and admits queued requests in weighted fair order as rate
+budget and tenant concurrency free up. Requests are only rejected when a
+queue is full or their deadline passes while they wait. ``acquire`` is
+instrumented as the ``rate_limit`` mitigation: its latency is the time a
+request waited for admission, and sheds are counted by their reason.
+"""
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+
+from metrics import instrument
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Request rejected by admission control: {reason}")
+        self.reason = reason
+
+
+class _Waiter:
+    __slots__ = ("user_id", "tenant", "future", "timer")
+
+    def __init__(self, user_id, tenant, future):
+        self.user_id = user_id
+        self.tenant = tenant
+        self.future = future
+        self.timer = None
+
+
+class AdmissionScheduler:
+    """Per-user weighted fair queues with a per-tenant in-flight cap.
+
+    ``limiter`` is any engine from ``rate_limiter`` (``allow(key) -> bool``).
+    Users are served in order of virtual finish time, which advances by
+    ``1 / weight`` per admitted request, so a user with weight 2 gets twice
+    the share of a user with weight 1 when both are backlogged.
+    """
+
+    sweep_min = 1024  # finish times kept before idle users are first swept out
+
+    def __init__(self, limiter=None, max_in_flight: int = 4, max_queue_depth: int = 32,
+                 timeout: float = 5.0, weights=None, retry_interval: float = 0.05):
+        self.limiter = limiter
+        self.max_in_flight = max_in_flight
+        self.max_queue_depth = max_queue_depth
+        self.timeout = timeout
+        self.weights = weights or {}
+        self.retry_interval = retry_interval
+        self._queues = {}  # user_id -> deque of waiters
+        self._finish = {}  # user_id -> virtual finish time
+        self._virtual_time = 0.0
+        self._sweep_at = self.sweep_min
+        self._in_flight = {}  # tenant -> admitted requests still running
+        self._retry_handle = None
+        self.shed = 0
+
+    @instrument("rate_limit")
+    async def acquire(self, user_id, tenant=None, timeout=None):
+        """Wait until the request may run; returns the tenant to pass to ``release``."""
+        tenant = user_id if tenant is None else tenant
+        queue = self._queues.get(user_id)
+        if not queue and self._try_admit(user_id, tenant):
+            return tenant
+        if queue and len(queue) >= self.max_queue_depth:
+            self.shed += 1
+            raise AdmissionRejected("queue full")
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(user_id, tenant, loop.create_future())
+        if not queue:
+            queue = self._queues[user_id] = deque()
+        queue.append(waiter)
+        waiter.timer = loop.call_later(self.timeout if timeout is None else timeout, self._expire, waiter)
+        self._schedule_retry()
+        try:
+            return await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(tenant)
+            else:
+                self._discard(waiter)
+            raise
+
+    def release(self, tenant):
+        self._in_flight[tenant] -= 1
+        if not self._in_flight[tenant]:
+            del self._in_flight[tenant]
+        self._dispatch()
+
+    @asynccontextmanager
+    async def admit(self, user_id, tenant=None, timeout=None):
+        tenant = await self.acquire(user_id, tenant, timeout)
+        try:
+            yield
+        finally:
+            self.release(tenant)
+
+    def _try_admit(self, user_id, tenant):
+        in_flight = self._in_flight.get(tenant, 0)
+        if in_flight >= self.max_in_flight:
+            return False
+        if self.limiter is not None and not self.limiter.allow(user_id):
+            return False
+        self._in_flight[tenant] = in_flight + 1
+        # Charge the user's virtual clock; an idle user starts at the current
+        # virtual time rather than with banked credit.
+        start = max(self._finish.get(user_id, 0.0), self._virtual_time)
+        self._virtual_time = start
+        self._finish[user_id] = start + 1.0 / self.weights.get(user_id, 1)
+        if len(self._finish) > self._sweep_at:
+            self._evict_idle()
+        return True
+
+    def _evict_idle(self):
+        # A finish time behind the virtual clock is the same as none at all
+        # unless the user has requests queued, so only those users need one.
+        now = self._virtual_time
+        for user_id in [u for u, finish in self._finish.items() if finish <= now and u not in self._queues]:
+            del self._finish[user_id]
+        # Doubling keeps the sweeps amortized O(1) per admission.
+        self._sweep_at = max(self.sweep_min, 2 * len(self._finish))
+
+    def _dispatch(self):
+        self._retry_handle = None
+        progress = True
+        while progress and self._queues:
+            progress = False
+            for user_id in sorted(self._queues, key=lambda u: self._finish.get(u, 0.0)):
+                waiter = self._queues[user_id][0]
+                if waiter.future.done():
+                    # Cancelled while queued; its task has not run its cleanup yet.
+                    self._pop(waiter)
+                    progress = True
+                    break
+                if not self._try_admit(user_id, waiter.tenant):
+                    continue
+                self._pop(waiter)
+                waiter.future.set_result(waiter.tenant)
+                progress = True
+                break
+        self._schedule_retry()
+
+    def _schedule_retry(self):
+        # Waiters held back by the rate limiter have no event to wake them, so poll.
+        if self.limiter is not None and self._queues and self._retry_handle is None:
+            self._retry_handle = asyncio.get_running_loop().call_later(self.retry_interval, self._dispatch)
+
+    def _expire(self, waiter):
+        if not waiter.future.done():
+            self._discard(waiter)
+            self.shed += 1
+            waiter.future.set_exception(AdmissionRejected("deadline exceeded"))
+
+    def _discard(self, waiter):
+        queue = self._queues.get(waiter.user_id)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[waiter.user_id]
+        if waiter.timer:
+            waiter.timer.cancel()
+
+    def _pop(self, waiter):
+        queue = self._queues[waiter.user_id]
+        queue.popleft()
+        if not queue:
+            del self._queues[waiter.user_id]
+        waiter.timer.cancel()
+
+
+def test_admission_scheduler():
+    import os
+    from metrics import METRICS
+
+    async def scenario():
+        scheduler = AdmissionScheduler(max_in_flight=1, max_queue_depth=3, timeout=0.5,
+                                       weights={"gold": 2})
+        order = []
+
+        async def job(user_id, tenant):
+            async with scheduler.admit(user_id, tenant):
+                order.append(user_id)
+                await asyncio.sleep(0.01)
+
+        # One tenant, one slot: once both are backlogged, gold gets twice basic's share.
+        users = ["blocker", "gold", "gold", "basic", "basic", "gold"]
+        await asyncio.gather(*(job(u, "acme") for u in users))
+        assert order == ["blocker", "gold", "basic", "gold", "gold", "basic"], order
+
+        await scheduler.acquire("u1", "t1")
+        try:
+            await scheduler.acquire("u1", "t1", timeout=0.05)
+            assert False, "expected the queued request to be shed"
+        except AdmissionRejected as e:
+            assert e.reason == "deadline exceeded"
+        assert scheduler.shed == 1
+        queued = [asyncio.ensure_future(scheduler.acquire("u1", "t1")) for _ in range(3)]
+        await asyncio.sleep(0)
+        try:
+            await scheduler.acquire("u1", "t1")
+            assert False, "expected a full queue to reject"
+        except AdmissionRejected as e:
+            assert e.reason == "queue full"
+        for _ in queued:
+            scheduler.release("t1")
+            await asyncio.sleep(0)
+        await asyncio.gather(*queued)
+        scheduler.release("t1")
+        assert not scheduler._queues and not scheduler._in_flight
+
+        # One-off users do not leave finish times behind.
+        scheduler = AdmissionScheduler(max_in_flight=10)
+        for i in range(5000):
+            for user_id in ("regular", f"user-{i}"):
+                await scheduler.acquire(user_id)
+                scheduler.release(user_id)
+        assert len(scheduler._finish) <= scheduler.sweep_min + 1 and not scheduler._in_flight
+
+    METRICS.reset()
+    asyncio.run(scenario())
+    if os.environ.get("A2A_METRICS", "1") != "0":
+        text = METRICS.export_prometheus()
+        assert 'a2a_mitigation_rejections_total{mitigation="rate_limit",reason="deadline exceeded"} 1' in text
+        assert 'a2a_mitigation_rejections_total{mitigation="rate_limit",reason="queue full"} 1' in text
+
+
+if __name__ == "__main__":
+    test_admission_scheduler()
+    print("Admission scheduler ran successfully.")
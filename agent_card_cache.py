@@ -0,0 +1,191 @@
+"""
+Cached AgentCard resolution with conditional revalidation.
+Mitigates: Agent Card Spoofing, Server Impersonation, DoS
+MAESTRO Layers: 4 (Deployment & Infrastructure), 7 (Agent Ecosystem)
+
+Resolving a peer's ``/.well-known/agent.json`` before every interaction costs
+a full HTTPS round trip. Cards are kept for their ``Cache-Control: max-age``
+(or ``ttl``), then revalidated with ``If-None-Match`` so an unchanged card
+costs a 304 and no body. Within ``stale_ttl`` a stale card is served at once
+while it is revalidated in the background; concurrent lookups of one URL
+share a single fetch. All fetches go through one pooled ``httpx.AsyncClient``.
+Card validators (URL scheme, signature, ...) run once per card version, i.e.
+only when the body changes.
+"""
+import asyncio
+import hashlib
+import re
+import time
+
+import httpx
+from common.types import AgentCard
+
+AGENT_CARD_PATH = "/.well-known/agent.json"
+
+_shared_client = None
+
+
+def shared_client() -> httpx.AsyncClient:
+    """Process-wide pooled client, so repeat fetches reuse kept-alive TLS connections."""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _shared_client
+
+
+def require_https(card: AgentCard, body: bytes):
+    if not card.url.startswith("https://"):
+        raise ValueError(f"Agent card URL must use HTTPS: {card.url}")
+
+
+class _Entry:
+    __slots__ = ("card", "etag", "digest", "fresh_until", "stale_until", "refresh")
+
+    def __init__(self, card, etag, digest, fresh_until, stale_until):
+        self.card, self.etag, self.digest = card, etag, digest
+        self.fresh_until, self.stale_until = fresh_until, stale_until
+        self.refresh = None  # in-flight revalidation task
+
+
+class AgentCardCache:
+    """AgentCards by base URL, with TTL, ETag revalidation and stale-while-revalidate."""
+
+    def __init__(self, ttl: float = 300.0, stale_ttl: float = 3600.0, validators=(require_https,),
+                 client: httpx.AsyncClient = None, clock=time.monotonic):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.validators = tuple(validators)
+        self._client = client
+        self._clock = clock
+        self._entries = {}  # card URL -> _Entry
+        self._pending = {}  # card URL -> task fetching a card not yet cached
+        self.fetches = self.not_modified = self.validations = 0
+
+    async def get(self, base_url: str) -> AgentCard:
+        url = base_url.rstrip("/") + AGENT_CARD_PATH
+        entry = self._entries.get(url)
+        now = self._clock()
+        if entry is not None:
+            if now < entry.fresh_until:
+                return entry.card
+            if now < entry.stale_until:
+                if entry.refresh is None:
+                    entry.refresh = asyncio.create_task(self._refresh_in_background(url, entry))
+                return entry.card
+        task = self._pending.get(url)
+        if task is None:
+            task = self._pending[url] = asyncio.create_task(self._fetch(url, entry))
+            task.add_done_callback(lambda _: self._pending.pop(url, None))
+        return await asyncio.shield(task)
+
+    def invalidate(self, base_url: str):
+        self._entries.pop(base_url.rstrip("/") + AGENT_CARD_PATH, None)
+
+    async def _refresh_in_background(self, url, entry):
+        try:
+            await self._fetch(url, entry)
+        except Exception:
+            pass  # keep serving the stale card until stale_until; the next foreground fetch raises
+        finally:
+            entry.refresh = None
+
+    async def _fetch(self, url, entry) -> AgentCard:
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else {}
+        response = await (self._client or shared_client()).get(url, headers=headers)
+        self.fetches += 1
+        now = self._clock()
+        fresh_until = now + self._max_age(response)
+        if response.status_code == 304 and entry is not None:
+            self.not_modified += 1
+            entry.fresh_until, entry.stale_until = fresh_until, fresh_until + self.stale_ttl
+            return entry.card
+        response.raise_for_status()
+        body = response.content
+        digest = hashlib.sha256(body).digest()
+        if entry is not None and digest == entry.digest:
+            card = entry.card  # same version, already validated
+        else:
+            card = AgentCard.model_validate_json(body)
+            for validate in self.validators:
+                validate(card, body)
+            self.validations += 1
+        self._entries[url] = _Entry(card, response.headers.get("ETag"), digest,
+                                    fresh_until, fresh_until + self.stale_ttl)
+        return card
+
+    def _max_age(self, response) -> float:
+        match = re.search(r"max-age=(\d+)", response.headers.get("Cache-Control", ""))
+        return float(match.group(1)) if match else self.ttl
+
+
+def test_agent_card_cache():
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    card = {"name": "Echo", "url": "https://echo.example.com/a2a", "version": "1.0",
+            "skills": [{"id": "echo", "name": "Echo"}]}
+    served = {"body": json.dumps(card).encode(), "etag": '"v1"', "hits": 0}
+
+    class CardHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so the pooled client reuses connections
+
+        def do_GET(self):
+            served["hits"] += 1
+            if self.headers.get("If-None-Match") == served["etag"]:
+                self.send_response(304)
+                self.send_header("ETag", served["etag"])
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", served["etag"])
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(served["body"])))
+            self.end_headers()
+            self.wfile.write(served["body"])
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), CardHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    now = [0.0]
+
+    async def run():
+        async with httpx.AsyncClient() as client:
+            cache = AgentCardCache(ttl=60, stale_ttl=600, client=client, clock=lambda: now[0])
+            cards = await asyncio.gather(*(cache.get(base_url) for _ in range(5)))
+            assert all(c.name == "Echo" for c in cards) and served["hits"] == 1  # single flight
+            assert cache.validations == 1
+            now[0] = 61.0  # stale: served immediately, revalidated in the background with a 304
+            assert (await cache.get(base_url)).name == "Echo"
+            await asyncio.sleep(0.2)
+            assert served["hits"] == 2 and cache.not_modified == 1 and cache.validations == 1
+            served["body"] = json.dumps(dict(card, name="Echo2")).encode()
+            served["etag"] = '"v2"'
+            now[0] = 10_000.0  # past stale_ttl: fetched in the foreground and validated again
+            assert (await cache.get(base_url)).name == "Echo2" and cache.validations == 2
+            served["body"] = json.dumps(dict(card, url="http://spoofed.example.com")).encode()
+            served["etag"] = '"v3"'
+            cache.invalidate(base_url)
+            try:
+                await cache.get(base_url)
+                raise AssertionError("plain-http card accepted")
+            except ValueError:
+                pass
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    test_agent_card_cache()
+    print("Agent card cache ran successfully.")
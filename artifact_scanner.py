@@ -0,0 +1,279 @@
+"""
+Incremental output verification for streamed A2A artifacts.
+Mitigates: Data Leakage, Artifact Tampering
+MAESTRO Layers: 2 (Data Operations), 3 (Agent Frameworks)
+
+Agents stream artifacts as a series of updates (``append``/``lastChunk``).
+The verifier checks each update as it arrives instead of buffering the whole
+artifact, and rejects the stream on the first forbidden term, even when the
+term is split across two updates.
+
+File and data parts are covered too. Inline base64 file content is decoded
+incrementally and local ``file://`` URIs are scanned through ``mmap``, so
+peak memory stays at one window no matter how large the artifact is. A peer
+only gets a local file scanned if it is a regular file under one of
+``ARTIFACT_ROOTS`` (``A2A_ARTIFACT_ROOTS``, ``os.pathsep``-separated) reached
+without symlinks; any other ``file://`` URI is left to the caller like a
+remote one, and a file that cannot be read is rejected as ``UNREADABLE_FILE``.
+"""
+import base64
+import binascii
+import codecs
+import mmap
+import os
+import stat
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from term_matcher import ForbiddenContentError, ForbiddenTermIndex, StreamScanner, TermMatch
+
+WINDOW = 64 * 1024  # decoded bytes scanned per step
+# Directories whose files peers may reference by file:// URI; empty means none.
+ARTIFACT_ROOTS = [root for root in os.environ.get("A2A_ARTIFACT_ROOTS", "").split(os.pathsep) if root]
+# Reported as the match when an allowed local file cannot be read.
+UNREADABLE_FILE = TermMatch("<unreadable file>", 0, 0)
+
+
+def _text_of(part):
+    # Duck-typed so it works with both common.types and samples.python.common.types.
+    text = getattr(part, "text", None)
+    return text if isinstance(text, str) else None
+
+
+def _scan_bytes(windows, scanner):
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for window in windows:
+        if scanner.feed(decoder.decode(window)):
+            return scanner.match
+    scanner.feed(decoder.decode(b"", final=True))
+    return scanner.finish()
+
+
+def _base64_windows(encoded: str):
+    # Decode a few kilobytes at a time; whitespace (MIME line breaks) may
+    # split a 4-character group, so the remainder carries to the next slice.
+    step = WINDOW // 3 * 4
+    carry = ""
+    try:
+        for i in range(0, len(encoded), step):
+            piece = carry + "".join(encoded[i:i + step].split())
+            cut = len(piece) - len(piece) % 4
+            carry = piece[cut:]
+            yield base64.b64decode(piece[:cut])
+        if carry:
+            yield base64.b64decode(carry)
+    except binascii.Error:
+        raise ValueError("Artifact file content is not valid base64")
+
+
+def _mmap_windows(path: str):
+    # O_NOFOLLOW/O_NONBLOCK: a path swapped for a symlink or FIFO after the checks fails instead of hanging.
+    fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW | os.O_NONBLOCK)
+    with open(fd, "rb") as f:
+        info = os.fstat(f.fileno())
+        if not stat.S_ISREG(info.st_mode):
+            raise OSError(f"Not a regular file: {path}")
+        if info.st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for i in range(0, len(mm), WINDOW):
+                yield mm[i:i + WINDOW]
+
+
+def local_path(uri: str, roots=None):
+    """Return the path of a ``file://`` URI that may be scanned locally, or ``None``.
+
+    Only regular files under one of ``roots`` (default ``ARTIFACT_ROOTS``)
+    qualify, and no component of the path may be a symlink.
+    """
+    parsed = urlparse(uri)
+    if parsed.scheme != "file" or parsed.netloc not in ("", "localhost"):
+        return None
+    path = os.path.abspath(url2pathname(parsed.path))
+    if os.path.realpath(path) != path or not os.path.isfile(path):
+        return None
+    for root in ARTIFACT_ROOTS if roots is None else roots:
+        root = os.path.realpath(root)
+        if os.path.commonpath([root, path]) == root:
+            return path
+    return None
+
+
+def _walk_strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from _walk_strings(key)
+            yield from _walk_strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _walk_strings(item)
+
+
+def scan_part(part, forbidden: ForbiddenTermIndex, roots=None):
+    """Scan a text, file or data part; returns the first ``TermMatch`` or ``None``.
+
+    Remote file URIs, and local ones outside ``roots``, are not read here and
+    are left to the caller. An allowed file that cannot be read returns
+    ``UNREADABLE_FILE``.
+    """
+    text = _text_of(part)
+    if text is not None:
+        return forbidden.search(text)
+    file = getattr(part, "file", None)
+    if file is not None:
+        if getattr(file, "bytes", None):
+            return _scan_bytes(_base64_windows(file.bytes), StreamScanner(forbidden))
+        path = local_path(getattr(file, "uri", None) or "", roots)
+        if path is not None:
+            try:
+                return _scan_bytes(_mmap_windows(path), StreamScanner(forbidden))
+            except OSError:
+                return UNREADABLE_FILE
+        return None
+    data = getattr(part, "data", None)
+    if data is not None:
+        scanner = StreamScanner(forbidden)
+        for value in _walk_strings(data):
+            # NUL is never part of a term, so it stops matches spanning two values.
+            if scanner.feed(value) or scanner.feed("\0"):
+                return scanner.match
+        return scanner.finish()
+    return None
+
+
+class StreamingArtifactVerifier:
+    """Verify one task's artifact stream, chunk by chunk.
+
+    Keeps one ``StreamScanner`` per artifact index, so memory is bounded by
+    the number of artifacts open at once, not by their size. Text parts of an
+    artifact are treated as one continuous text.
+    """
+
+    def __init__(self, forbidden: ForbiddenTermIndex):
+        self.forbidden = forbidden
+        self._scanners = {}
+        self.rejected = None
+
+    def feed(self, update):
+        """Verify an ``Artifact`` chunk or a ``TaskArtifactUpdateEvent``; returns it unchanged.
+
+        Raises ``ForbiddenContentError`` on the first match, and on every
+        later call, since a rejected stream must not be resumed.
+        """
+        if self.rejected:
+            raise ForbiddenContentError(self.rejected)
+        artifact = getattr(update, "artifact", update)
+        index = getattr(artifact, "index", 0) or 0
+        scanner = self._scanners.get(index)
+        if scanner is None or not getattr(artifact, "append", False):
+            # A non-append chunk replaces the artifact; the old text may still
+            # hold a match that was waiting on what came next (a word boundary).
+            if scanner is not None and scanner.finish():
+                self._reject(scanner.match)
+            scanner = self._scanners[index] = StreamScanner(self.forbidden)
+        for part in artifact.parts:
+            text = _text_of(part)
+            if text is not None:
+                if scanner.feed(text):
+                    self._reject(scanner.match)
+            else:
+                match = scan_part(part, self.forbidden)
+                if match:
+                    self._reject(match)
+        if getattr(artifact, "lastChunk", False):
+            del self._scanners[index]
+            if scanner.finish():
+                self._reject(scanner.match)
+        return update
+
+    def close(self):
+        """End of the task's stream: flush every artifact that never sent ``lastChunk``."""
+        scanners, self._scanners = self._scanners, {}
+        for scanner in scanners.values():
+            if scanner.finish():
+                self._reject(scanner.match)
+
+    def _reject(self, match):
+        self.rejected = match
+        self._scanners.clear()
+        raise ForbiddenContentError(match)
+
+
+def test_streaming_artifact_verifier():
+    from types import SimpleNamespace as Obj
+
+    def chunk(text, append=True, last=False):
+        return Obj(index=0, append=append, lastChunk=last, parts=[Obj(type="text", text=text)])
+
+    verifier = StreamingArtifactVerifier(ForbiddenTermIndex({"exploit"}))
+    verifier.feed(chunk("Here is the ", append=False))
+    verifier.feed(chunk("expl"))
+    try:
+        verifier.feed(chunk("oit code", last=True))
+        assert False, "expected the split term to be caught"
+    except ForbiddenContentError as e:
+        assert e.match.term == "exploit"
+    try:
+        verifier.feed(chunk("more"))
+        assert False, "a rejected stream must stay rejected"
+    except ForbiddenContentError:
+        pass
+
+    verifier = StreamingArtifactVerifier(ForbiddenTermIndex({"exploit"}))
+    for text in ("Safe ", "output"):
+        verifier.feed(chunk(text))
+    verifier.feed(chunk("", last=True))
+    verifier.close()
+    assert verifier.rejected is None
+
+    # A match pending at the end of an artifact is not lost when a non-append chunk replaces it.
+    verifier = StreamingArtifactVerifier(ForbiddenTermIndex({"hack"}, word_boundaries=True))
+    verifier.feed(chunk("this is a hack", append=False))
+    try:
+        verifier.feed(chunk("replacement", append=False))
+        assert False, "expected the pending match to be caught"
+    except ForbiddenContentError as e:
+        assert e.match.term == "hack"
+
+
+def test_scan_file_and_data_parts():
+    import tempfile
+    from types import SimpleNamespace as Obj
+    forbidden = ForbiddenTermIndex({"exploit"})
+    # Place the term across a decode window boundary.
+    payload = b"x" * (WINDOW - 3) + b"EXPLOIT" + b"y" * 10
+    encoded = base64.encodebytes(payload).decode()  # with MIME line breaks
+    assert scan_part(Obj(file=Obj(bytes=encoded, uri=None)), forbidden).start == WINDOW - 3
+    assert scan_part(Obj(file=Obj(bytes=base64.b64encode(b"clean").decode(), uri=None)), forbidden) is None
+    with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as outside:
+        root = os.path.realpath(root)
+        inside = os.path.join(root, "report.txt")
+        secret = os.path.join(outside, "secret.txt")
+        for path in (inside, secret):
+            with open(path, "wb") as f:
+                f.write(payload)
+        os.symlink(secret, os.path.join(root, "link.txt"))
+        os.mkfifo(os.path.join(root, "fifo"))
+
+        def file_part(path):
+            return Obj(file=Obj(bytes=None, uri="file://" + path))
+
+        assert scan_part(file_part(inside), forbidden, roots=[root]).term == "exploit"
+        assert scan_part(file_part(inside), forbidden) is None  # no roots configured
+        for path in (secret, os.path.join(root, "link.txt"), os.path.join(root, "fifo"), root,
+                     os.path.join(root, "missing.txt"), os.path.join(root, "..", os.path.basename(outside))):
+            assert scan_part(file_part(path), forbidden, roots=[root]) is None
+        os.chmod(inside, 0)
+        if os.geteuid() != 0:  # root can read it anyway
+            assert scan_part(file_part(inside), forbidden, roots=[root]) is UNREADABLE_FILE
+    assert scan_part(Obj(file=Obj(bytes=None, uri="https://example.com/a")), forbidden) is None
+    assert scan_part(Obj(data={"steps": ["ok", {"note": "an exploit"}]}), forbidden).term == "exploit"
+    assert scan_part(Obj(data={"a": "expl", "b": "oit"}), forbidden) is None
+
+
+if __name__ == "__main__":
+    test_streaming_artifact_verifier()
+    test_scan_file_and_data_parts()
+    print("Streaming artifact verifier ran successfully.")
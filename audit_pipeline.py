@@ -0,0 +1,181 @@
+"""
+Non-blocking, batched audit logging.
+Mitigates: DoS (slow log sinks stalling requests), Insider Threats, Cross-Layer Attacks
+MAESTRO Layers: 5 (Evaluation & Observability), 6 (Security & Compliance)
+
+Request handlers only put the ``LogRecord`` on a bounded queue; formatting
+and I/O happen on a background writer thread. The writer collects up to
+``batch_size`` records or whatever arrived within ``flush_interval`` and
+writes them to each handler, flushing a stream once per batch rather than
+once per record. When the queue is full the ``"drop"`` policy discards the
+record and counts it; ``"block"`` waits up to ``block_timeout`` and counts
+the record as dropped if it still does not fit. Dropped records are audit
+gaps, so ``stats()["dropped"]`` should be monitored.
+"""
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler
+
+_STOP = object()
+
+
+class _BoundedQueueHandler(QueueHandler):
+    def __init__(self, pipeline):
+        super().__init__(pipeline._queue)
+        self.pipeline = pipeline
+
+    def prepare(self, record):
+        # Keep msg/args unformatted; the writer thread formats them (lazy %-formatting).
+        return record
+
+    def enqueue(self, record):
+        self.pipeline._put(record)
+
+
+class AuditPipeline:
+    """Queue handler plus a batching background writer in front of ordinary logging handlers."""
+
+    def __init__(self, handlers, capacity: int = 10_000, batch_size: int = 256, flush_interval: float = 0.5,
+                 policy: str = "drop", block_timeout: float = None):
+        if policy not in ("drop", "block"):
+            raise ValueError(f"Unknown overflow policy: {policy!r}")
+        self.handlers = list(handlers)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self._queue = queue.Queue(capacity)
+        self.handler = _BoundedQueueHandler(self)
+        self._thread = None
+        self._lock = threading.Lock()
+        self.enqueued = self.dropped = self.written = self.batches = 0
+
+    def attach(self, logger: logging.Logger):
+        """Route ``logger`` through the pipeline instead of its ancestors' handlers."""
+        logger.addHandler(self.handler)
+        logger.propagate = False
+        return self
+
+    def _put(self, record):
+        try:
+            if self.policy == "drop":
+                self._queue.put_nowait(record)
+            else:
+                self._queue.put(record, timeout=self.block_timeout)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+        with self._lock:
+            self.enqueued += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Write everything still queued, then stop the writer."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        get = self._queue.get
+        while True:
+            record = get()
+            stopping = record is _STOP
+            batch = [] if stopping else [record]
+            deadline = time.monotonic() + self.flush_interval
+            while not stopping and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    record = get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    stopping = True
+                else:
+                    batch.append(record)
+            if stopping:  # drain whatever is left
+                while True:
+                    try:
+                        record = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if record is not _STOP:
+                        batch.append(record)
+            if batch:
+                self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, batch):
+        for handler in self.handlers:
+            stream = getattr(handler, "stream", None)
+            if stream is None or not isinstance(handler, logging.StreamHandler):
+                for record in batch:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+                continue
+            handler.acquire()
+            try:
+                lines = [handler.format(r) + handler.terminator for r in batch
+                         if r.levelno >= handler.level and handler.filter(r)]
+                stream.write("".join(lines))
+                stream.flush()
+            except Exception:
+                handler.handleError(batch[-1])
+            finally:
+                handler.release()
+        with self._lock:
+            self.written += len(batch)
+            self.batches += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"enqueued": self.enqueued, "dropped": self.dropped, "written": self.written,
+                    "batches": self.batches, "queued": self._queue.qsize()}
+
+
+def test_audit_pipeline():
+    import io
+
+    stream = io.StringIO()
+    sink = logging.StreamHandler(stream)
+    sink.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    logger = logging.getLogger("test_audit_pipeline")
+    logger.setLevel(logging.INFO)
+    pipeline = AuditPipeline([sink], batch_size=50, flush_interval=0.05).attach(logger).start()
+    for i in range(120):
+        logger.info("Task %s: %s", i, "working")
+    pipeline.stop()
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "INFO Task 0: working" and len(lines) == 120
+    assert pipeline.stats()["written"] == 120 and pipeline.stats()["batches"] >= 3
+
+    # A stalled sink: the drop policy never blocks the caller and counts the loss.
+    release = threading.Event()
+
+    class StalledHandler(logging.Handler):
+        def emit(self, record):
+            release.wait()
+
+    stalled = AuditPipeline([StalledHandler()], capacity=10, batch_size=1, policy="drop").start()
+    record = logging.LogRecord("audit", logging.INFO, __file__, 0, "event", None, None)
+    started = time.monotonic()
+    for _ in range(100):
+        stalled.handler.handle(record)
+    assert time.monotonic() - started < 1.0
+    assert stalled.stats()["dropped"] >= 80
+    release.set()
+    stalled.stop()
+    assert stalled.stats()["written"] + stalled.stats()["dropped"] == 100
+
+
+if __name__ == "__main__":
+    test_audit_pipeline()
+    print("Audit pipeline ran successfully.")
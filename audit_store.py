@@ -0,0 +1,294 @@
+"""
+Segmented, indexed audit store with lookup by task, user and time range.
+Mitigates: Insider Threats, Cross-Layer Attacks, Task Replay
+MAESTRO Layers: 5 (Evaluation & Observability), 6 (Security & Compliance)
+
+Audit events are appended as JSON lines to rotating segment files. Every
+segment has a sidecar index: byte offsets of its records per task ID and per
+user, a sparse ``(timestamp, offset)`` index, and its time bounds. The index
+of the active segment is kept in memory and written out when it rotates.
+``query`` only opens the segments whose time bounds overlap the request,
+jumps straight to the indexed offsets through ``mmap``, and never scans a
+segment for a task or user lookup. A query plans its reads under the store's
+lock, then reads without it; segments it is reading are only unlinked by
+rotation once it is done with them.
+
+``AuditStoreHandler`` feeds the store from the logging calls
+(``log_task_status``, ``safe_log``); ``task_id`` and ``user`` come from the
+record's ``extra``.
+"""
+import bisect
+import glob
+import json
+import logging
+import mmap
+import os
+import time
+from threading import Lock
+
+SPARSE_EVERY = 64  # one time-index entry per this many records
+
+
+class _Index:
+    def __init__(self):
+        self.min_ts = self.max_ts = None
+        self.count = 0
+        self.tasks = {}  # task_id -> [offset, ...]
+        self.users = {}  # user -> [offset, ...]
+        self.times = []  # sparse [[ts, offset], ...]
+
+    def add(self, event: dict, offset: int):
+        ts = event["ts"]
+        if self.min_ts is None:
+            self.min_ts = ts
+        self.max_ts = ts
+        if self.count % SPARSE_EVERY == 0:
+            self.times.append([ts, offset])
+        self.count += 1
+        if event.get("task_id") is not None:
+            self.tasks.setdefault(event["task_id"], []).append(offset)
+        if event.get("user") is not None:
+            self.users.setdefault(event["user"], []).append(offset)
+
+    def to_json(self) -> dict:
+        return {"min_ts": self.min_ts, "max_ts": self.max_ts, "count": self.count,
+                "tasks": self.tasks, "users": self.users, "times": self.times}
+
+    @classmethod
+    def from_json(cls, data: dict):
+        index = cls()
+        index.__dict__.update(data)
+        return index
+
+
+class AuditStore:
+    """Append-only audit log in rotating JSONL segments with per-segment sidecar indexes."""
+
+    def __init__(self, directory: str, segment_bytes: int = 64 * 1024 * 1024, max_segments: int = None):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self._lock = Lock()
+        self._segments = []  # [(path, _Index)], oldest first; the last one is active
+        self._readers = {}  # path -> number of queries reading it
+        self._retired = set()  # rotated out, unlinked once no query reads them
+        paths = sorted(glob.glob(os.path.join(directory, "audit-*.jsonl")))
+        for path in paths:
+            # The active segment may have grown since its sidecar was written.
+            self._segments.append((path, self._load_index(path, trust_sidecar=path != paths[-1])))
+        if not self._segments:
+            self._segments.append((self._segment_path(1), _Index()))
+        self._file = open(self._segments[-1][0], "ab")
+        self._last_ts = self._segments[-1][1].max_ts or 0.0
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"audit-{number:08d}.jsonl")
+
+    def _load_index(self, path: str, trust_sidecar: bool = True) -> _Index:
+        try:
+            if trust_sidecar:
+                with open(path[:-len(".jsonl")] + ".idx") as f:
+                    return _Index.from_json(json.load(f))
+        except (OSError, ValueError):
+            pass
+        # Active segment, or a crash before the sidecar was written: rebuild it once.
+        index = _Index()
+        with open(path, "rb") as f:
+            offset = 0
+            for line in f:
+                if line.endswith(b"\n"):
+                    index.add(json.loads(line), offset)
+                offset += len(line)
+        return index
+
+    def _write_index(self, path: str, index: _Index):
+        sidecar = path[:-len(".jsonl")] + ".idx"
+        with open(sidecar + ".tmp", "w") as f:
+            json.dump(index.to_json(), f, separators=(",", ":"))
+        os.replace(sidecar + ".tmp", sidecar)
+
+    def append(self, event: dict) -> dict:
+        """Store an event; ``ts`` is assigned here, non-decreasing, so segments stay time-ordered."""
+        with self._lock:
+            self._last_ts = max(time.time(), self._last_ts)
+            event = dict(event, ts=self._last_ts)
+            line = (json.dumps(event, separators=(",", ":"), default=str) + "\n").encode()
+            if self._file.tell() and self._file.tell() + len(line) > self.segment_bytes:
+                self._rotate()
+            offset = self._file.tell()
+            self._file.write(line)
+            self._segments[-1][1].add(event, offset)
+        return event
+
+    def _rotate(self):
+        path, index = self._segments[-1]
+        self._file.close()
+        self._write_index(path, index)
+        number = int(os.path.basename(path)[len("audit-"):-len(".jsonl")]) + 1
+        self._segments.append((self._segment_path(number), _Index()))
+        self._file = open(self._segments[-1][0], "ab")
+        while self.max_segments and len(self._segments) > self.max_segments:
+            old, _ = self._segments.pop(0)
+            self._retired.add(old)
+            if not self._readers.get(old):
+                self._unlink(old)
+
+    def _unlink(self, path: str):
+        self._retired.discard(path)
+        os.unlink(path)
+        os.unlink(path[:-len(".jsonl")] + ".idx")
+
+    def _pin(self, paths):
+        # Caller holds the lock.
+        for path in paths:
+            self._readers[path] = self._readers.get(path, 0) + 1
+
+    def _unpin(self, paths):
+        with self._lock:
+            for path in paths:
+                self._readers[path] -= 1
+                if not self._readers[path]:
+                    del self._readers[path]
+                    if path in self._retired:
+                        self._unlink(path)
+
+    def query(self, task_id=None, user=None, since: float = None, until: float = None, limit: int = None):
+        """Return matching events in time order."""
+        reads = []  # (path, offsets or None, start offset)
+        with self._lock:
+            # The active segment's index keeps growing, so take copies of what is read.
+            self._file.flush()
+            for path, index in self._segments:
+                if index.min_ts is None or (since is not None and index.max_ts < since) \
+                        or (until is not None and index.min_ts > until):
+                    continue
+                if task_id is not None or user is not None:
+                    offsets = None
+                    for key, table in ((task_id, index.tasks), (user, index.users)):
+                        if key is not None:
+                            found = table.get(key, ())
+                            offsets = list(found) if offsets is None else sorted(set(offsets) & set(found))
+                    if offsets:
+                        reads.append((path, offsets, 0))
+                    continue
+                start = 0
+                if since is not None and index.times:
+                    position = bisect.bisect_right([t for t, _ in index.times], since) - 1
+                    start = index.times[max(position, 0)][1]
+                reads.append((path, None, start))
+            self._pin([path for path, _, _ in reads])
+        try:
+            results = []
+            for path, offsets, start in reads:
+                events = self._read_at(path, offsets) if offsets is not None else self._read_from(path, start, until)
+                for event in events:
+                    if (since is None or event["ts"] >= since) and (until is None or event["ts"] <= until):
+                        results.append(event)
+                        if limit is not None and len(results) >= limit:
+                            return results
+            return results
+        finally:
+            self._unpin([path for path, _, _ in reads])
+
+    @staticmethod
+    def _read_at(path, offsets):
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset in offsets:
+                yield json.loads(mm[offset:mm.find(b"\n", offset)])
+
+    @staticmethod
+    def _read_from(path, start, until):
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            offset = start
+            while True:
+                end = mm.find(b"\n", offset)
+                if end < 0:
+                    return
+                event = json.loads(mm[offset:end])
+                if until is not None and event["ts"] > until:
+                    return
+                yield event
+                offset = end + 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+            self._write_index(*self._segments[-1])
+
+
+class AuditStoreHandler(logging.Handler):
+    """Logging handler that appends records to an ``AuditStore``.
+
+    ``logger.info("...", extra={"task_id": ..., "user": ...})`` makes the
+    record findable by task and user.
+    """
+
+    def __init__(self, store: AuditStore, level=logging.NOTSET):
+        super().__init__(level)
+        self.store = store
+
+    def emit(self, record):
+        try:
+            self.store.append({
+                "level": record.levelname,
+                "logger": record.name,
+                "task_id": getattr(record, "task_id", None),
+                "user": getattr(record, "user", None),
+                "message": record.getMessage(),
+            })
+        except Exception:
+            self.handleError(record)
+
+
+def test_audit_store():
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AuditStore(tmp, segment_bytes=4096)
+        for i in range(300):
+            store.append({"task_id": f"task-{i % 10}", "user": f"user-{i % 3}", "message": f"event {i}"})
+        assert len(glob.glob(os.path.join(tmp, "audit-*.jsonl"))) > 3
+        events = store.query(task_id="task-7")
+        assert [e["message"] for e in events] == [f"event {i}" for i in range(7, 300, 10)]
+        both = store.query(task_id="task-1", user="user-2")
+        assert [e["message"] for e in both] == [f"event {i}" for i in range(11, 300, 30)]
+        everything = store.query()
+        assert len(everything) == 300
+        since, until = everything[100]["ts"], everything[199]["ts"]
+        window = store.query(since=since, until=until)
+        assert window[0]["message"] == "event 100" and window[-1]["message"] == "event 199"
+        assert len(store.query(user="user-0", limit=5)) == 5
+
+        logger = logging.getLogger("test_audit_store")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        logger.addHandler(AuditStoreHandler(store))
+        logger.info("Task %s: %s", "completed", "done", extra={"task_id": "task-x", "user": "alice"})
+        store.close()
+
+        reopened = AuditStore(tmp, segment_bytes=4096)  # sidecars load; the active segment is rebuilt
+        [event] = reopened.query(task_id="task-x")
+        assert event["message"] == "Task completed: done" and event["user"] == "alice"
+        assert len(reopened.query()) == 301
+        reopened.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # A segment a query is still reading outlives its rotation until the query is done.
+        store = AuditStore(tmp, segment_bytes=4096, max_segments=2)
+        store.append({"task_id": "task-0", "message": "first"})
+        oldest = store._segments[0][0]
+        with store._lock:
+            store._pin([oldest])
+        while store._segments[0][0] == oldest:
+            store.append({"task_id": "task-1", "message": "x" * 100})
+        assert os.path.exists(oldest) and oldest in store._retired
+        assert not store.query(task_id="task-0")
+        store._unpin([oldest])
+        assert not os.path.exists(oldest) and not store._retired
+        assert len(glob.glob(os.path.join(tmp, "audit-*.jsonl"))) == 2
+        store.close()
+
+
+if __name__ == "__main__":
+    test_audit_store()
+    print("Audit store ran successfully.")
@@ -5,14 +5,63 @@ MAESTRO Layers: 3 (Agent Frameworks), 4 (Deployment & Infrastructure), 7 (Agent
 """
 from jose import jwt, JWTError
 from common.types import AuthenticationInfo, AgentCard
+from agent_card_cache import AgentCardCache
+from authz_policy import Authorizer
+from jwks import JWKSKeySet
+from jwt_cache import TOKEN_CACHE, VerifiedTokenCache, load_public_key
+from metrics import instrument
+from jwt_offload import AsyncJWTVerifier
 import os
 
-def validate_jwt(token, public_key, audience):
+@instrument("jwt_validation")
+def validate_jwt(token, public_key, audience, cache: VerifiedTokenCache = TOKEN_CACHE):
+    if cache is not None:
+        payload = cache.get(token, public_key, audience)
+        if payload is not None:
+            return payload  # verified earlier; no RSA work
+    key = load_public_key(public_key) if isinstance(public_key, (str, bytes)) else public_key
     try:
-        payload = jwt.decode(token, public_key, audience=audience, algorithms=['RS256'])
-        return payload  # contains user identity and claims
+        payload = jwt.decode(token, key, audience=audience, algorithms=['RS256'])
     except JWTError:
         raise ValueError('Invalid or expired token')
+    if cache is not None:
+        if cache.is_revoked(token, payload):
+            raise ValueError('Token has been revoked')
+        cache.put(token, public_key, audience, payload)
+    return payload  # contains user identity and claims
+
+def validate_jwt_with_jwks(token, keys: JWKSKeySet, audience, cache: VerifiedTokenCache = TOKEN_CACHE):
+    """Validate a JWT against the single key named by its ``kid`` header."""
+    try:
+        kid = jwt.get_unverified_header(token).get('kid')
+    except JWTError:
+        raise ValueError('Invalid or expired token')
+    key = keys.get(kid)
+    if key is None:
+        raise ValueError('Unknown signing key')
+    return validate_jwt(token, key, audience, cache)
+
+def authorize_request(token, public_key, audience, skill_id, authorizer: Authorizer):
+    """Validate the caller's JWT, then check it may invoke ``skill_id`` on this agent.
+
+    Raises ``ValueError`` for a bad token and ``PermissionError`` for a denied skill.
+    """
+    claims = validate_jwt(token, public_key, audience)
+    authorizer.authorize(claims, skill_id)
+    return claims
+
+# Worker processes start on first use; call JWT_VERIFIER.close() on shutdown.
+JWT_VERIFIER = AsyncJWTVerifier(cache=TOKEN_CACHE)
+
+async def validate_jwt_async(token, public_key, audience):
+    """``validate_jwt`` for asyncio servers: signature checks run off the event loop."""
+    return await JWT_VERIFIER.verify(token, public_key, audience)
+
+# Peer AgentCards, revalidated with If-None-Match once stale; URL checks run once per card version.
+AGENT_CARDS = AgentCardCache()
+
+async def resolve_agent_card(base_url) -> AgentCard:
+    return await AGENT_CARDS.get(base_url)
 
 def get_authentication_info() -> AuthenticationInfo:
     """Retrieve credentials for A2A authentication from environment."""
@@ -25,7 +74,4 @@ def get_authentication_info() -> AuthenticationInfo:
 if __name__ == "__main__":
     auth_info = get_authentication_info()
     # Example AgentCard validation (pseudo):
-    # from common.client.card_resolver import A2ACardResolver
-    # resolver = A2ACardResolver(base_url)
-    # agent_card = resolver.resolve()
-    # assert agent_card.url.startswith("https://")
+    # agent_card = await resolve_agent_card(base_url)  # cached; raises ValueError for a non-HTTPS card URL
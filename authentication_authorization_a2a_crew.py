@@ -3,27 +3,54 @@ Mitigation Example 3: Strong Authentication & Authorization (A2A + Google GenAI
 Uses JWT and environment-based credentials to ensure agent identity and secure operations.
 """
 from samples.python.common.types import AuthenticationInfo
-from crewai import Agent, Crew, LLM, Task
-from crewai.process import Process
-from dotenv import load_dotenv
 import os
+from crew_support import LazyCrew
 from jose import jwt, JWTError
-from google import genai
+from authz_policy import Authorizer
+from jwks import JWKSKeySet
+from jwt_cache import TOKEN_CACHE, VerifiedTokenCache, load_public_key
+from metrics import instrument
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("authz")
 
-def get_api_key():
-    load_dotenv()
-    return os.getenv("GOOGLE_API_KEY")
+@instrument("jwt_validation")
+def validate_jwt(token, public_key, audience, cache: VerifiedTokenCache = TOKEN_CACHE):
+    if cache is not None:
+        payload = cache.get(token, public_key, audience)
+        if payload is not None:
+            return payload
+    key = load_public_key(public_key) if isinstance(public_key, (str, bytes)) else public_key
+    try:
+        payload = jwt.decode(token, key, audience=audience, algorithms=['RS256'])
+    except JWTError:
+        raise ValueError('Invalid or expired token')
+    if cache is not None:
+        if cache.is_revoked(token, payload):
+            raise ValueError('Token has been revoked')
+        cache.put(token, public_key, audience, payload)
+    return payload
 
-def validate_jwt(token, public_key, audience):
+def validate_jwt_with_jwks(token, keys: JWKSKeySet, audience, cache: VerifiedTokenCache = TOKEN_CACHE):
+    """Validate a JWT against the single key named by its ``kid`` header."""
     try:
-        payload = jwt.decode(token, public_key, audience=audience, algorithms=['RS256'])
-        return payload
+        kid = jwt.get_unverified_header(token).get('kid')
     except JWTError:
         raise ValueError('Invalid or expired token')
+    key = keys.get(kid)
+    if key is None:
+        raise ValueError('Unknown signing key')
+    return validate_jwt(token, key, audience, cache)
+
+def authorize_request(token, public_key, audience, skill_id, authorizer: Authorizer):
+    """Validate the caller's JWT, then check it may invoke ``skill_id`` on this agent.
+
+    Raises ``ValueError`` for a bad token and ``PermissionError`` for a denied skill.
+    """
+    claims = validate_jwt(token, public_key, audience)
+    authorizer.authorize(claims, skill_id)
+    return claims
 
 def get_authentication_info() -> AuthenticationInfo:
     token = os.environ.get("A2A_TOKEN")
@@ -31,29 +58,13 @@ def get_authentication_info() -> AuthenticationInfo:
         raise EnvironmentError("A2A_TOKEN not set")
     return AuthenticationInfo(schemes=["bearer"], credentials=token)
 
-class AuthAgent:
-    def __init__(self):
-        self.llm = LLM(model="gemini/gemini-2.0-flash", api_key=get_api_key())
-        self.agent = Agent(
-            role="Auth Validator",
-            goal="Ensure all credentials and JWTs are valid before processing requests.",
-            backstory="You are a security agent that checks credentials and JWTs for every operation.",
-            verbose=False,
-            allow_delegation=False,
-            tools=[],
-            llm=self.llm,
-        )
-        self.task = Task(
-            description="Validate credentials and JWT tokens for secure operations.",
-            expected_output="Valid credentials or an error if invalid.",
-            agent=self.agent,
-        )
-        self.crew = Crew(
-            agents=[self.agent],
-            tasks=[self.task],
-            process=Process.sequential,
-            verbose=False,
-        )
+class AuthAgent(LazyCrew):
+    role = "Auth Validator"
+    goal = "Ensure all credentials and JWTs are valid before processing requests."
+    backstory = "You are a security agent that checks credentials and JWTs for every operation."
+    task_description = "Validate credentials and JWT tokens for secure operations."
+    expected_output = "Valid credentials or an error if invalid."
+
     def check(self):
         try:
             info = get_authentication_info()
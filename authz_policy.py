@@ -0,0 +1,170 @@
+"""
+Compiled skill-level authorization from an AgentCard policy.
+Mitigates: Cross-Agent Task Escalation, Insider Threats
+MAESTRO Layers: 3 (Agent Frameworks), 6 (Security & Compliance), 7 (Agent Ecosystem)
+
+``validate_jwt`` proves who the caller is; this decides what it may invoke.
+A policy names, per skill of the ``AgentCard``, the agent IDs, roles and
+scopes allowed to call it. It is compiled once into a decision table where
+every agent ID, role and scope is one bit, so a check is a few integer
+operations. The caller's claims are turned into a bit mask once per claim
+set and cached. Skills without a rule are denied.
+
+Rules come from a ``{skill_id: {"agents": [...], "roles": [...], "scopes": [...]}}``
+mapping and/or from skill tags of the form ``agent:<id>``, ``role:<name>``
+and ``scope:<name>``. Within a rule, the caller must be one of the agents (if
+any are listed), hold one of the roles (if any), and hold all of the scopes.
+An empty rule ``{}`` admits any authenticated agent.
+"""
+from collections import OrderedDict
+from threading import Lock
+
+_KINDS = ("agents", "roles", "scopes")
+_TAG_PREFIXES = {"agent:": "agents", "role:": "roles", "scope:": "scopes"}
+
+
+class CompiledPolicy:
+    """Immutable decision table: ``skill_id -> (agent_mask, role_mask, scope_mask)``."""
+
+    def __init__(self, rules: dict, version: int = 0):
+        self.version = version
+        self._bits = {}  # (kind, value) -> bit
+        self._table = {}
+        for skill_id, rule in rules.items():
+            self._table[skill_id] = tuple(self._mask(kind, rule.get(kind, ())) for kind in _KINDS)
+
+    def _mask(self, kind, values):
+        mask = 0
+        for value in values:
+            mask |= self._bits.setdefault((kind, value), 1 << len(self._bits))
+        return mask
+
+    @classmethod
+    def from_agent_card(cls, card, rules: dict = None, version: int = 0):
+        """Compile the rules for the card's skills; rules for skills the card does not publish are ignored."""
+        rules = rules or {}
+        compiled = {}
+        for skill in card.skills:
+            rule = {kind: list(values) for kind, values in rules.get(skill.id, {}).items()}
+            tagged = False
+            for tag in getattr(skill, "tags", None) or ():
+                for prefix, kind in _TAG_PREFIXES.items():
+                    if tag.startswith(prefix):
+                        rule.setdefault(kind, []).append(tag[len(prefix):])
+                        tagged = True
+            if skill.id in rules or tagged:
+                compiled[skill.id] = rule
+        return cls(compiled, version)
+
+    def claims_mask(self, agent, roles, scopes) -> int:
+        bits = self._bits
+        mask = bits.get(("agents", agent), 0)
+        for role in roles:
+            mask |= bits.get(("roles", role), 0)
+        for scope in scopes:
+            mask |= bits.get(("scopes", scope), 0)
+        return mask
+
+    def allows(self, mask: int, skill_id: str) -> bool:
+        rule = self._table.get(skill_id)
+        if rule is None:
+            return False
+        agents, roles, scopes = rule
+        return bool((not agents or mask & agents) and (not roles or mask & roles)
+                    and mask & scopes == scopes)
+
+
+class Authorizer:
+    """Checks ``validate_jwt`` claims against a ``CompiledPolicy`` that can be swapped at runtime."""
+
+    def __init__(self, policy: CompiledPolicy, max_claim_sets: int = 4096):
+        self.max_claim_sets = max_claim_sets
+        self._policy = policy
+        self._masks = OrderedDict()  # (policy, agent, roles, scopes) -> claims mask
+        self._lock = Lock()
+
+    @property
+    def policy(self) -> CompiledPolicy:
+        return self._policy
+
+    def load(self, policy: CompiledPolicy):
+        """Swap in a new policy; in-flight checks finish against the one they started with."""
+        with self._lock:
+            self._policy = policy
+            self._masks.clear()
+
+    @staticmethod
+    def _names(value) -> tuple:
+        # Space-separated strings (as in the OAuth "scope" claim) or lists of names.
+        return tuple(value.split() if isinstance(value, str) else value or ())
+
+    @staticmethod
+    def claim_set(claims: dict):
+        agent = claims.get("agent_id") or claims.get("azp") or claims.get("sub")
+        names = Authorizer._names
+        return agent, names(claims.get("roles")), names(claims.get("scp")) or names(claims.get("scope"))
+
+    def is_allowed(self, claims: dict, skill_id: str) -> bool:
+        policy = self._policy
+        agent, roles, scopes = self.claim_set(claims)
+        key = (policy, agent, roles, scopes)
+        with self._lock:
+            mask = self._masks.get(key)
+            if mask is not None:
+                self._masks.move_to_end(key)
+        if mask is None:
+            mask = policy.claims_mask(agent, roles, scopes)
+            with self._lock:
+                if policy is self._policy:
+                    self._masks[key] = mask
+                    while len(self._masks) > self.max_claim_sets:
+                        self._masks.popitem(last=False)
+        return policy.allows(mask, skill_id)
+
+    def authorize(self, claims: dict, skill_id: str):
+        """Raise ``PermissionError`` unless the claims may invoke ``skill_id``."""
+        if not self.is_allowed(claims, skill_id):
+            raise PermissionError(f"Agent {self.claim_set(claims)[0]!r} is not authorized for skill {skill_id!r}")
+
+
+def test_authorizer():
+    from types import SimpleNamespace as NS
+    card = NS(skills=[
+        NS(id="summarize", tags=["scope:tasks:write"]),
+        NS(id="transfer", tags=["finance"]),
+        NS(id="admin", tags=[]),
+        NS(id="ping", tags=None),
+    ])
+    rules = {"transfer": {"agents": ["agent-a"], "roles": ["payer", "admin"], "scopes": ["tasks:write", "funds"]},
+             "ping": {}, "unpublished": {}}
+    authz = Authorizer(CompiledPolicy.from_agent_card(card, rules, version=1))
+    writer = {"sub": "agent-b", "scope": "tasks:read tasks:write"}
+    payer = {"sub": "agent-a", "roles": ["payer"], "scope": "tasks:write funds"}
+    assert authz.is_allowed(writer, "summarize") and not authz.is_allowed({"sub": "agent-b"}, "summarize")
+    assert authz.is_allowed(payer, "transfer")
+    assert not authz.is_allowed(dict(payer, sub="agent-b"), "transfer")  # wrong agent
+    assert not authz.is_allowed(dict(payer, roles=["viewer"]), "transfer")  # no allowed role
+    assert not authz.is_allowed(dict(payer, scope="funds"), "transfer")  # missing a scope
+    assert authz.is_allowed({"sub": "anyone"}, "ping")
+    # String-valued claims are split on whitespace, never into characters.
+    assert authz.claim_set({"sub": "agent-a", "roles": "payer", "scp": "tasks:write funds"}) == \
+        ("agent-a", ("payer",), ("tasks:write", "funds"))
+    assert authz.is_allowed({"sub": "agent-a", "roles": "payer", "scp": "tasks:write funds"}, "transfer")
+    single = Authorizer(CompiledPolicy.from_agent_card(card, {"transfer": {"roles": ["a"]}}, version=1))
+    assert not single.is_allowed({"sub": "agent-a", "roles": "admin"}, "transfer")
+    assert not authz.is_allowed(payer, "admin") and not authz.is_allowed(payer, "unpublished")
+    try:
+        authz.authorize(writer, "transfer")
+        raise AssertionError("escalation allowed")
+    except PermissionError:
+        pass
+    # Reload: summarize now also needs the "editor" role.
+    authz.load(CompiledPolicy.from_agent_card(card, {"summarize": {"roles": ["editor"]}}, version=2))
+    assert not authz.is_allowed(writer, "summarize")
+    assert authz.is_allowed(dict(writer, roles=["editor"]), "summarize")
+    assert not authz.is_allowed(payer, "transfer")
+
+
+if __name__ == "__main__":
+    test_authorizer()
+    print("Authorizer ran successfully.")
@@ -0,0 +1,73 @@
+"""
+Benchmark: cold start of the ``*_a2a_crew.py`` agents.
+
+Each module is imported in a fresh interpreter, then its agent class is
+instantiated once and another 100 times, then the first deterministic check
+runs. When ``crewai`` is installed, the time of the first ``agent.crew``
+access (when the LLM, Agent, Task and Crew get built) is reported
+separately; otherwise that column shows "-".
+
+Run from the repository root:
+    python -m benchmarks.bench_crew_startup
+"""
+import json
+import subprocess
+import sys
+
+AGENTS = {
+    "input_validation_a2a_crew": ("InputValidationAgent", "agent.validate('Hello, world!')"),
+    "output_verification_a2a_crew": ("OutputVerificationAgent", "agent.verify(Artifact(parts=[TextPart(text='ok')]))"),
+    "authentication_authorization_a2a_crew": ("AuthAgent", "agent.check()"),
+    "rate_limiting_a2a_crew": ("RateLimitAgent", "agent.check('user1')"),
+    "schema_validation_a2a_crew": ("SchemaValidationAgent", "agent.validate({'role': 'user', 'parts': []})"),
+    "secure_cache_a2a_crew": ("SecureCacheAgent", "agent.cache.get('artifact')"),
+    "logging_observability_a2a_crew": ("LoggingObservabilityAgent", "agent.log('user_login')"),
+    "credential_hygiene_a2a_crew": ("CredentialHygieneAgent", "agent.hygiene('BENCH_TOKEN')"),
+}
+
+PROBE = """
+import json, logging, time
+started = time.perf_counter()
+import {module} as m
+imported = time.perf_counter()
+agent = m.{cls}()
+first = time.perf_counter()
+for _ in range(100):
+    m.{cls}()
+more = time.perf_counter()
+logging.disable(logging.CRITICAL)
+from samples.python.common.types import Artifact, TextPart
+ready = time.perf_counter()
+{call}
+checked = time.perf_counter()
+try:
+    import crewai
+except ImportError:
+    crew = None
+else:
+    agent.crew
+    crew = time.perf_counter() - checked
+print(json.dumps({{"import": imported - started, "first": first - imported, "each": (more - first) / 100,
+                  "check": checked - ready, "crew": crew}}))
+"""
+
+
+def probe(module: str, cls: str, call: str) -> dict:
+    result = subprocess.run([sys.executable, "-c", PROBE.format(module=module, cls=cls, call=call)],
+                            capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f"{module}: {result.stderr.strip().splitlines()[-1]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    print(f"{'module':<40} {'import ms':>10} {'1st init ms':>12} {'init us':>9} {'check ms':>9} {'crew ms':>9}")
+    for module, (cls, call) in AGENTS.items():
+        t = probe(module, cls, call)
+        crew = f"{t['crew'] * 1e3:9.1f}" if t["crew"] is not None else f"{'-':>9}"
+        print(f"{module:<40} {t['import'] * 1e3:10.1f} {t['first'] * 1e3:12.3f} {t['each'] * 1e6:9.2f} "
+              f"{t['check'] * 1e3:9.3f} {crew}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: batch input sanitization vs. one sanitize_message_parts call per message.
+
+Run from the repository root:
+    python -m benchmarks.bench_input_scan
+"""
+import random
+import string
+import timeit
+
+from common.types import Message, TextPart
+from input_validation import sanitize_message_parts, sanitize_messages
+
+
+def make_history(turns: int, min_words: int, max_words: int, seed: int = 0):
+    rng = random.Random(seed)
+    def text():
+        return " ".join("".join(rng.choices(string.ascii_letters, k=6))
+                        for _ in range(rng.randint(min_words, max_words)))
+    return [Message(role=rng.choice(["user", "agent"]),
+                    parts=[TextPart(text=text()) for _ in range(rng.randint(1, 3))])
+            for _ in range(turns)]
+
+
+def loop_verdicts(history):
+    verdicts = []
+    for message in history:
+        try:
+            sanitize_message_parts(message)
+            verdicts.append(True)
+        except ValueError:
+            verdicts.append(False)
+    return verdicts
+
+
+def main(number: int = 200):
+    print(f"{'history':>26} {'loop ms':>9} {'batch ms':>9} {'speedup':>8}")
+    for turns, words in ((50, (1, 8)), (200, (1, 8)), (200, (3, 60)), (200, (100, 400))):
+        history = make_history(turns, *words)
+        loop = timeit.timeit(lambda: loop_verdicts(history), number=number) / number
+        batch = timeit.timeit(lambda: sanitize_messages(history), number=number) / number
+        label = f"{turns} turns x {words[0]}-{words[1]} words"
+        print(f"{label:>26} {loop * 1e3:9.3f} {batch * 1e3:9.3f} {loop / batch:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: inline validate_jwt vs. AsyncJWTVerifier with 1..N worker processes.
+
+Every token is distinct and the cache is disabled, so each one costs a full
+RS256 verification. Besides throughput, the largest event-loop stall seen by
+a 1 ms ticker task is reported: inline verification starves the loop, the
+offloaded path keeps it responsive.
+
+Run from the repository root:
+    python -m benchmarks.bench_jwt_offload
+"""
+import asyncio
+import os
+import time
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from authentication_authorization import validate_jwt
+from jwt_offload import AsyncJWTVerifier
+
+
+def make_tokens(count: int):
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                        serialization.NoEncryption())
+    public_pem = private.public_key().public_bytes(serialization.Encoding.PEM,
+                                                   serialization.PublicFormat.SubjectPublicKeyInfo)
+    signing_key = jwk.construct(private_pem, "RS256")  # parse once; PEM parsing dominates signing
+    exp = int(time.time()) + 3600
+    return public_pem, [jwt.encode({"sub": f"agent-{i}", "aud": "a2a", "exp": exp}, signing_key, algorithm="RS256")
+                        for i in range(count)]
+
+
+async def measure(verify, tokens, public_pem):
+    """Return (tokens per second, worst event-loop stall in ms) for ``verify`` over ``tokens``."""
+    stall = 0.0
+    running = True
+
+    async def ticker():
+        nonlocal stall
+        last = time.perf_counter()
+        while running:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stall = max(stall, now - last - 0.001)
+            last = now
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    started = time.perf_counter()
+    await asyncio.gather(*(verify(token, public_pem, "a2a") for token in tokens))
+    elapsed = time.perf_counter() - started
+    running = False
+    await tick
+    return len(tokens) / elapsed, stall * 1e3
+
+
+async def inline(token, public_pem, audience):
+    return validate_jwt(token, public_pem, audience, cache=None)
+
+
+async def main(count: int = 4000):
+    public_pem, tokens = make_tokens(count)
+    print(f"{'mode':>12} {'tokens/s':>10} {'speedup':>8} {'max stall ms':>13}")
+    base, stall = await measure(inline, tokens, public_pem)
+    print(f"{'inline':>12} {base:10.0f} {1.0:7.2f}x {stall:13.1f}")
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        verifier = AsyncJWTVerifier(workers=workers)
+        try:
+            await measure(verifier.verify, tokens[:workers * 64], public_pem)  # start the workers
+            rate, stall = await measure(verifier.verify, tokens, public_pem)
+        finally:
+            verifier.close()
+        print(f"{f'{workers} workers':>12} {rate:10.0f} {rate / base:7.2f}x {stall:13.1f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+"""
+Benchmark: fused SecurityPipeline vs. calling each mitigation one by one.
+
+One "request" is: check an incoming message (input sanitization and schema),
+verify an outgoing artifact (content and schema), and log a status update.
+The sequential path calls ``sanitize_message_parts``,
+``validate_message_schema(deep=False)``, ``filter_artifact_content``, the
+``ARTIFACT`` schema adapter and ``log_task_status``; the fused path calls
+``check_message``, ``check_artifact`` and ``audit_status``. Metrics recording
+is switched off for both, so only the checks themselves are compared.
+
+Run from the repository root:
+    python -m benchmarks.bench_security_pipeline
+"""
+import logging
+import timeit
+
+from benchmarks.suite import make_artifact, make_message, make_task_status
+from common.types import Artifact, TextPart
+from input_validation import sanitize_message_parts
+from logging_observability import log_task_status, logger
+from metrics import METRICS
+from output_verification import filter_artifact_content
+from schema_validation import ARTIFACT, validate_message_schema
+from security_pipeline import SecurityPipeline
+
+
+def stages(pipeline, message, artifact, status):
+    """``(stage, sequential call, fused call)`` for each step of one request."""
+    def sequential_message():
+        try:
+            sanitize_message_parts(message)
+            validate_message_schema(message, deep=False)
+        except ValueError:
+            pass
+
+    def sequential_artifact():
+        try:
+            filter_artifact_content(artifact)
+            ARTIFACT.validate_python(artifact.__dict__)
+        except ValueError:
+            pass
+
+    return [
+        ("message", sequential_message, lambda: pipeline.check_message(message)),
+        ("artifact", sequential_artifact, lambda: pipeline.check_artifact(artifact)),
+        ("status log", lambda: log_task_status(status, "task-1", "alice"),
+         lambda: pipeline.audit_status(status, "task-1", "alice")),
+    ]
+
+
+def sequential(message, artifact, status):
+    try:
+        sanitize_message_parts(message)
+        validate_message_schema(message, deep=False)
+        filter_artifact_content(artifact)
+        ARTIFACT.validate_python(artifact.__dict__)
+        log_task_status(status, "task-1", "alice")
+    except ValueError:
+        return False
+    return True
+
+
+def fused(pipeline, message, artifact, status):
+    return (pipeline.check_message(message).allowed and pipeline.check_artifact(artifact).allowed
+            and pipeline.audit_status(status, "task-1", "alice").allowed)
+
+
+def best_of(fns, repeat):
+    """Best seconds per call of each function; runs are interleaved so drift hits both alike."""
+    timers = [timeit.Timer(fn) for fn in fns]
+    numbers = [timer.autorange()[0] for timer in timers]
+    best = [float("inf")] * len(fns)
+    for _ in range(repeat):
+        for i, (timer, number) in enumerate(zip(timers, numbers)):
+            best[i] = min(best[i], timer.timeit(number) / number)
+    return best
+
+
+def main(repeat: int = 7):
+    METRICS.enabled = False
+    logger.handlers[:] = [logging.NullHandler()]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    pipeline = SecurityPipeline()
+
+    cases = []
+    for parts, size in ((1, 64), (4, 256), (16, 256), (16, 4096)):
+        message = make_message(parts, size)
+        text_artifact = Artifact(parts=[TextPart(text=part.text) for part in make_message(parts, size, 1).parts])
+        cases.append((f"{parts} x {size} B", message, text_artifact, make_task_status(min(size, 1024))))
+    cases.append(("16 x 1024 B, file+data parts", make_message(16, 1024), make_artifact(16, 1024),
+                  make_task_status(1024)))
+    rejected = make_message(16, 1024)
+    rejected.parts[-1] = TextPart(text="<script>")
+    cases.append(("16 x 1024 B, last part unsafe", rejected, Artifact(parts=[TextPart(text="ok")]),
+                  make_task_status(64)))
+
+    print(f"{'request':>30} {'stage':>10} {'sequential us':>14} {'fused us':>9} {'speedup':>8}")
+    for label, message, artifact, status in cases:
+        assert sequential(message, artifact, status) == fused(pipeline, message, artifact, status)
+        rows = [(name, *best_of(pair, repeat)) for name, *pair in stages(pipeline, message, artifact, status)]
+        rows.append(("total", *best_of([lambda: sequential(message, artifact, status),
+                                        lambda: fused(pipeline, message, artifact, status)], repeat)))
+        for name, before, after in rows:
+            print(f"{label:>30} {name:>10} {before * 1e6:14.2f} {after * 1e6:9.2f} {before / after:7.2f}x")
+            label = ""
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: InMemoryCache vs. ShardedCache under concurrent threads.
+
+Each thread runs a 90% get / 10% set mix, either spread over 1000 keys or
+all on one hot key (the SecureCacheAgent.cache_example pattern). Scaling
+with threads depends on the interpreter: on a GIL build the lock-free reads
+mostly save lock overhead, on a free-threaded build they also run in parallel.
+
+Run from the repository root:
+    python -m benchmarks.bench_sharded_cache
+"""
+import random
+import threading
+import time
+
+from common.utils.in_memory_cache import InMemoryCache
+from sharded_cache import ShardedCache
+
+
+def run(cache, threads: int, keys, ops_per_thread: int) -> float:
+    """Return operations per second across all threads."""
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        picks = [(rng.choice(keys), rng.random() < 0.1) for _ in range(ops_per_thread)]
+        barrier.wait()
+        for key, write in picks:
+            if write:
+                cache.set(key, "v")
+            else:
+                cache.get(key)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in pool:
+        t.join()
+    return threads * ops_per_thread / (time.perf_counter() - started)
+
+
+def main(ops_per_thread: int = 100_000):
+    spread = [f"artifact:{i}" for i in range(1000)]
+    print(f"{'workload':>10} {'threads':>8} {'InMemory ops/s':>15} {'Sharded ops/s':>14} {'speedup':>8}")
+    for label, keys in (("spread", spread), ("hot key", ["key"])):
+        for threads in (1, 2, 4, 8):
+            baseline = InMemoryCache()
+            baseline.clear()
+            sharded = ShardedCache()
+            for cache in (baseline, sharded):
+                for key in keys:
+                    cache.set(key, "v")
+            old = run(baseline, threads, keys, ops_per_thread)
+            new = run(sharded, threads, keys, ops_per_thread)
+            print(f"{label:>10} {threads:>8} {old:15.0f} {new:14.0f} {new / old:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
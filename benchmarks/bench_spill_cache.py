@@ -0,0 +1,65 @@
+"""
+Benchmark: heap size, full-GC time and lookup latency with large artifacts
+held in BoundedCache (all on the heap) vs. SpillCache (spilled to mmap).
+
+Run from the repository root:
+    python -m benchmarks.bench_spill_cache
+"""
+import gc
+import os
+import random
+import shutil
+import string
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+from bounded_cache import BoundedCache
+from spill_cache import SpillCache
+
+
+def make_artifact(rng, parts: int = 200, part_chars: int = 1000) -> dict:
+    text = "".join(rng.choices(string.ascii_letters + " ", k=part_chars))
+    return {"name": "report", "parts": [{"type": "text", "text": text, "metadata": {"index": i}}
+                                        for i in range(parts)]}
+
+
+def measure(cache, artifacts: int, make) -> dict:
+    rng = random.Random(0)
+    gc.collect()
+    tracemalloc.start()
+    for i in range(artifacts):
+        cache.set(f"artifact:{i}", make(rng))
+    heap = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    started = time.perf_counter()
+    gc.collect()
+    gc_ms = (time.perf_counter() - started) * 1e3
+    keys = [f"artifact:{i}" for i in range(artifacts)]
+    get_us = timeit.timeit(lambda: cache.get(rng.choice(keys)), number=200) / 200 * 1e6
+    return {"heap_mb": heap / 2**20, "gc_ms": gc_ms, "get_us": get_us}
+
+
+def make_file(rng, size: int = 200 * 1024) -> bytes:
+    return rng.randbytes(size)
+
+
+def main(artifacts: int = 500):
+    directory = tempfile.mkdtemp(prefix="a2a-spill-bench-")
+    try:
+        print(f"{artifacts} artifacts of ~200 KiB each")
+        print(f"{'payload':>8} {'cache':>12} {'heap MiB':>9} {'full GC ms':>11} {'get us':>8}")
+        for payload, make in (("json", make_artifact), ("bytes", make_file)):
+            for label, cache in (("BoundedCache", BoundedCache()), ("SpillCache", SpillCache(directory))):
+                result = measure(cache, artifacts, make)
+                print(f"{payload:>8} {label:>12} {result['heap_mb']:9.1f} {result['gc_ms']:11.2f} "
+                      f"{result['get_us']:8.1f}")
+                cache.clear()
+    finally:
+        shutil.rmtree(directory)
+        assert not os.path.exists(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Microbenchmark suite for the eight mitigation modules, on synthetic A2A payloads.
+
+Times input validation, output verification, JWT validation, rate limiting,
+schema validation, caching, audit logging and credential handling over
+generated ``Message``/``Artifact``/``TaskStatus`` payloads of several sizes
+and part counts. Everything runs offline: the JWT key pair is generated
+locally and no LLM or API key is involved.
+
+Each case reports the best per-call time over ``--repeat`` runs. Results are
+written as JSON with ``--output``; ``--write-baseline`` stores them as the
+baseline, and later runs compare against it and exit with status 1 when any
+case got slower than ``--threshold`` (default 20%). Baselines are specific
+to the machine they were recorded on.
+
+Run from the repository root:
+    python -m benchmarks.suite --write-baseline
+    python -m benchmarks.suite --output results.json
+"""
+import argparse
+import base64
+import functools
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import string
+import sys
+import time
+import timeit
+
+from common.types import (Artifact, DataPart, FileContent, FilePart, Message, TaskState, TaskStatus,
+                          TextPart)
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# (parts per payload, bytes per part)
+SIZES = ((1, 64), (4, 1024), (16, 16 * 1024))
+
+
+def make_text(rng: random.Random, size: int) -> str:
+    """Benign text of about ``size`` bytes: no markup, no forbidden terms, no newlines."""
+    words = []
+    length = 0
+    while length < size:
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def make_message(parts: int, size: int, seed: int = 0) -> Message:
+    rng = random.Random(seed)
+    return Message(role="user", parts=[TextPart(text=make_text(rng, size)) for _ in range(parts)])
+
+
+def make_artifact(parts: int, size: int, seed: int = 0) -> Artifact:
+    """Mostly text parts, with a data part and a base64 file part mixed in once there are several."""
+    rng = random.Random(seed)
+    items = [TextPart(text=make_text(rng, size)) for _ in range(parts)]
+    if parts >= 4:
+        items[1] = DataPart(data={"summary": make_text(rng, size // 2), "score": rng.random()})
+        items[2] = FilePart(file=FileContent(name="report.txt", mimeType="text/plain",
+                                             bytes=base64.b64encode(make_text(rng, size).encode()).decode()))
+    return Artifact(name="result", parts=items)
+
+
+def make_task_status(size: int, seed: int = 0) -> TaskStatus:
+    return TaskStatus(state=TaskState.WORKING, message=make_message(1, size, seed))
+
+
+def make_jwt(audience: str = "a2a"):
+    """Return ``(public PEM, signed RS256 token)`` from a freshly generated key pair."""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from jose import jwk, jwt
+
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                        serialization.NoEncryption())
+    public_pem = private.public_key().public_bytes(serialization.Encoding.PEM,
+                                                   serialization.PublicFormat.SubjectPublicKeyInfo)
+    claims = {"sub": "agent-1", "aud": audience, "exp": int(time.time()) + 24 * 3600}
+    return public_pem, jwt.encode(claims, jwk.construct(private_pem, "RS256"), algorithm="RS256")
+
+
+def _input_validation():
+    from input_validation import sanitize_message_parts, sanitize_messages
+    for parts, size in SIZES:
+        message = make_message(parts, size)
+        yield f"input_validation/sanitize[{parts}x{size}]", lambda m=message: sanitize_message_parts(m)
+    history = [make_message(parts, size, seed) for seed, (parts, size) in enumerate(SIZES * 20)]
+    yield f"input_validation/history[{len(history)} msgs]", lambda: sanitize_messages(history)
+
+
+def _output_verification():
+    from output_verification import FORBIDDEN_TERMS, filter_artifact_content
+    from term_matcher import ForbiddenTermIndex
+    for parts, size in SIZES:
+        artifact = make_artifact(parts, size)
+        yield f"output_verification/filter[{parts}x{size}]", lambda a=artifact: filter_artifact_content(a)
+    # The default term list (two terms, no word boundaries) and the same list matched on word boundaries.
+    text = make_text(random.Random(0), 100 * 1024)
+    bounded = ForbiddenTermIndex(FORBIDDEN_TERMS.terms, word_boundaries=True)
+    yield "output_verification/search[default,100KB]", lambda: FORBIDDEN_TERMS.search(text)
+    yield "output_verification/search[word_boundaries,100KB]", lambda: bounded.search(text)
+
+
+def _jwt():
+    from authentication_authorization import validate_jwt
+    from jwt_cache import VerifiedTokenCache
+    public_pem, token = make_jwt()
+    cache = VerifiedTokenCache()
+    yield "jwt/verify[uncached]", lambda: validate_jwt(token, public_pem, "a2a", cache=None)
+    yield "jwt/verify[cached]", lambda: validate_jwt(token, public_pem, "a2a", cache=cache)
+
+
+def _rate_limiting():
+    import asyncio
+    from rate_limiting import SecureTaskManager
+    loop = asyncio.new_event_loop()
+    for mode in ("token_bucket", "gcra"):
+        # The clock advances a second per reading, so every request is admitted without queueing.
+        scheduler = SecureTaskManager(mode=mode, clock=functools.partial(next, itertools.count()))._admission
+        users = [f"user-{i}" for i in range(10_000)]
+        position = [0]
+
+        async def admit(scheduler=scheduler, users=users, position=position):
+            # A batch per loop round trip, so the event loop's own overhead stays out of the figure.
+            for _ in range(100):
+                position[0] = (position[0] + 1) % len(users)
+                async with scheduler.admit(users[position[0]]):
+                    pass
+        yield f"rate_limit/admit[{mode},100 requests]", lambda admit=admit: loop.run_until_complete(admit())
+    loop.close()
+
+
+def _schema_validation():
+    from schema_validation import MESSAGE, validate_json, validate_message_schema
+    for parts, size in SIZES:
+        message = make_message(parts, size)
+        raw = message.model_dump_json().encode()
+        yield f"schema_validation/deep[{parts}x{size}]", lambda m=message: validate_message_schema(m)
+        yield f"schema_validation/shallow[{parts}x{size}]", lambda m=message: validate_message_schema(m, deep=False)
+        yield f"schema_validation/json[{parts}x{size}]", lambda r=raw: validate_json(r, MESSAGE)
+
+
+def _cache():
+    from bounded_cache import BoundedCache
+    from sharded_cache import ShardedCache
+    from spill_cache import SpillCache
+    keys = [f"artifact:{i}" for i in range(1000)]
+    value = make_artifact(4, 1024).model_dump()
+    for name, cache in (("bounded", BoundedCache(max_entries=10_000, default_ttl=3600)),
+                        ("sharded", ShardedCache(default_ttl=3600))):
+        for key in keys:
+            cache.set(key, value)
+        position = [0]
+
+        def get(cache=cache, position=position):
+            position[0] = (position[0] + 1) % len(keys)
+            return cache.get(keys[position[0]])
+        yield f"cache/get[{name}]", get
+        yield f"cache/set[{name}]", lambda cache=cache: cache.set("artifact:hot", value)
+    spill = SpillCache(threshold=64 * 1024, default_ttl=3600)
+    spill.set("artifact:large", os.urandom(256 * 1024))
+    yield "cache/get[spill 256KiB]", lambda: spill.get("artifact:large").release()
+    spill.close()
+
+
+def _logging():
+    from audit_pipeline import AuditPipeline
+    from logging_observability import log_task_status, logger
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    for parts, size in SIZES[:2]:
+        status = make_task_status(size)
+        logger.handlers[:] = [logging.NullHandler()]
+        yield f"audit_logging/log[null handler,{size}]", lambda s=status: log_task_status(s, "task-1", "alice")
+    # Caller-side cost when records go through the batching pipeline; the writer drains it meanwhile.
+    pipeline = AuditPipeline([logging.NullHandler()], capacity=1_000_000).start()
+    status = make_task_status(64)
+    logger.handlers[:] = [pipeline.handler]
+    yield "audit_logging/log[pipeline]", lambda: log_task_status(status, "task-1", "alice")
+    pipeline.stop()
+
+
+def _credentials():
+    from authentication_authorization import get_authentication_info
+    from credential_hygiene import rotate_a2a_token
+    saved = os.environ.get("A2A_TOKEN")
+
+    def restore():
+        if saved is None:
+            os.environ.pop("A2A_TOKEN", None)
+        else:
+            os.environ["A2A_TOKEN"] = saved
+
+    def rotate():
+        try:
+            return rotate_a2a_token()
+        finally:
+            restore()
+
+    def audit():
+        os.environ["A2A_TOKEN"] = "benchmark-token"
+        try:
+            return get_authentication_info()
+        finally:
+            restore()
+    yield "credentials/rotate", rotate
+    yield "credentials/audit", audit
+
+
+GROUPS = {
+    "input_validation": _input_validation,
+    "output_verification": _output_verification,
+    "jwt": _jwt,
+    "rate_limit": _rate_limiting,
+    "schema_validation": _schema_validation,
+    "cache": _cache,
+    "audit_logging": _logging,
+    "credentials": _credentials,
+}
+
+
+def time_call(fn, repeat: int) -> float:
+    """Best seconds per call over ``repeat`` runs of an auto-sized loop."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(groups, repeat: int) -> dict:
+    results = {}
+    for group in groups:
+        for name, fn in GROUPS[group]():
+            results[name] = time_call(fn, repeat)
+            print(f"{name:<48} {results[name] * 1e6:12.2f} us", flush=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print current vs. baseline timings; return the names that regressed past ``threshold``."""
+    regressions = []
+    print(f"\n{'case':<48} {'baseline us':>12} {'current us':>12} {'change':>8}")
+    for name, seconds in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<48} {'-':>12} {seconds * 1e6:12.2f} {'new':>8}")
+            continue
+        change = seconds / before - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<48} {before * 1e6:12.2f} {seconds * 1e6:12.2f} {change:+7.1%}{flag}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--only", nargs="+", choices=sorted(GROUPS), help="run only these mitigations")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--write-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, e.g. 0.2 for 20%%")
+    args = parser.parse_args(argv)
+
+    results = run(args.only or list(GROUPS), args.repeat)
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.write_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"\nNo baseline at {args.baseline}; record one with --write-baseline")
+        return 0
+    if baseline.get("platform") != report["platform"] or baseline.get("python") != report["python"]:
+        print(f"\nWarning: baseline was recorded on {baseline.get('platform')}, Python {baseline.get('python')}")
+    regressions = compare(results, baseline["results"], args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""
+Bounded artifact cache: per-entry TTL, LRU eviction and memory accounting.
+Mitigates: DoS (unbounded memory growth), Artifact Tampering, Insider Threats
+MAESTRO Layers: 3 (Agent Frameworks), 4 (Deployment & Infrastructure)
+
+Drop-in for ``InMemoryCache`` (same ``set``/``get``/``delete``/``clear``)
+that cannot grow without bound. Entries expire after their TTL; expired
+entries are dropped when read and, at most every ``sweep_interval`` seconds,
+by a sweep over an expiry heap run from ``set``/``get``. When ``max_entries``
+or ``max_bytes`` is exceeded, least recently used entries are evicted.
+Sizes are approximate (see ``approx_size``).
+"""
+import heapq
+import sys
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+def approx_size(value) -> int:
+    """Rough payload size in bytes: string/bytes length, summed over containers."""
+    if isinstance(value, (str, bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(approx_size(k) + approx_size(v) for k, v in value.items()) + 64
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sum(approx_size(v) for v in value) + 56
+    if hasattr(value, "model_dump_json"):  # pydantic models such as Artifact
+        return len(value.model_dump_json())
+    return sys.getsizeof(value)
+
+
+class BoundedCache:
+    """Thread-safe TTL + LRU cache bounded by entry count and/or approximate bytes."""
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None, default_ttl: float = None,
+                 sweep_interval: float = 60.0, sizeof=approx_size, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.sweep_interval = sweep_interval
+        self._sizeof = sizeof
+        self._clock = clock
+        self._data = OrderedDict()  # key -> (value, size, expires or None)
+        self._expiries = []  # heap of (expires, key); stale items are skipped
+        self._bytes = 0
+        self._next_sweep = clock() + sweep_interval
+        self._lock = Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def set(self, key, value, ttl: float = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        size = self._sizeof(value)
+        now = self._clock()
+        expires = now + ttl if ttl is not None else None
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return  # would evict everything else and still not fit
+            self._data[key] = (value, size, expires)
+            self._bytes += size
+            if expires is not None:
+                heapq.heappush(self._expiries, (expires, key))
+            self._maybe_sweep(now)
+            self._evict()
+
+    def get(self, key, default=None):
+        now = self._clock()
+        with self._lock:
+            self._maybe_sweep(now)
+            entry = self._data.get(key)
+            if entry is not None and entry[2] is not None and now >= entry[2]:
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def ttl_remaining(self, key):
+        """Seconds until ``key`` expires; ``None`` if it is missing or never expires."""
+        entry = self._data.get(key)
+        if entry is None or entry[2] is None:
+            return None
+        return max(entry[2] - self._clock(), 0.0)
+
+    def delete(self, key) -> bool:
+        with self._lock:
+            if key not in self._data:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self) -> bool:
+        with self._lock:
+            self._data.clear()
+            self._expiries.clear()
+            self._bytes = 0
+            return True
+
+    def sweep(self) -> int:
+        """Drop every expired entry now; returns how many were removed."""
+        with self._lock:
+            return self._sweep(self._clock())
+
+    def _maybe_sweep(self, now):
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+    def _sweep(self, now) -> int:
+        self._next_sweep = now + self.sweep_interval
+        removed = 0
+        heap = self._expiries
+        while heap and heap[0][0] <= now:
+            expires, key = heapq.heappop(heap)
+            entry = self._data.get(key)
+            if entry is not None and entry[2] == expires:  # not re-set since
+                self._remove(key)
+                removed += 1
+        self.expirations += removed
+        if len(heap) > 2 * len(self._data) + 64:  # mostly stale after overwrites/deletes
+            self._expiries = [(e[2], k) for k, e in self._data.items() if e[2] is not None]
+            heapq.heapify(self._expiries)
+        return removed
+
+    def _remove(self, key):
+        self._bytes -= self._data.pop(key)[1]
+
+    def _evict(self):
+        while self._data and ((self.max_entries is not None and len(self._data) > self.max_entries)
+                              or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            _, (_, size, _) = self._data.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+def test_bounded_cache():
+    now = [0.0]
+    cache = BoundedCache(max_entries=3, max_bytes=100, default_ttl=10, sweep_interval=5, clock=lambda: now[0])
+    cache.set("artifact:1", {"result": "data"})
+    assert cache.get("artifact:1") == {"result": "data"}
+    assert cache.delete("artifact:1") and not cache.delete("artifact:1")
+    assert cache.get("artifact:1") is None
+    # LRU by entry count: touching a keeps it, b is evicted.
+    for key in "abc":
+        cache.set(key, "x")
+    cache.get("a")
+    cache.set("d", "x")
+    assert cache.get("b") is None and cache.get("a") == "x" and cache.stats()["evictions"] == 1
+    # LRU by bytes.
+    cache.set("big", "y" * 90)
+    assert cache.stats()["bytes"] <= 100 and cache.get("big") == "y" * 90
+    cache.set("huge", "z" * 101)
+    assert cache.get("huge") is None and cache.get("big") == "y" * 90
+    # Lazy expiry on read, and periodic sweep of entries nobody reads.
+    cache.clear()
+    cache.set("short", "s", ttl=1)
+    cache.set("long", "l", ttl=100)
+    cache.set("default", "d")  # default_ttl
+    now[0] = 2.0
+    assert cache.get("short") is None and cache.stats()["expirations"] == 1
+    assert cache.ttl_remaining("long") == 98.0 and cache.ttl_remaining("short") is None
+    cache.set("soon", "s", ttl=1)
+    now[0] = 6.0
+    cache.get("long")  # past sweep_interval: sweeps "soon"
+    assert len(cache) == 2 and cache.stats()["expirations"] == 2
+    stats = cache.stats()
+    assert stats["hits"] >= 4 and stats["misses"] >= 3
+
+
+if __name__ == "__main__":
+    test_bounded_cache()
+    print("Bounded cache ran successfully.")
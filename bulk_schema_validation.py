@@ -0,0 +1,146 @@
+"""
+Bulk schema validation of A2A message archives stored as JSON Lines.
+Mitigates: Message Schema Violation, Task Replay
+MAESTRO Layers: 2 (Data Operations), 6 (Security & Compliance)
+
+Re-validates an archive after a schema change. The file is streamed in
+batches of raw lines (never loaded whole), batches are validated in a
+process pool straight from their JSON bytes, and failures are written to a
+compact JSONL report with line numbers and error paths.
+
+Usage:
+    python bulk_schema_validation.py archive.jsonl --report errors.jsonl --workers 8
+"""
+import argparse
+import importlib
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_VALIDATOR = "schema_validation:MESSAGE"
+
+_validators = {}  # per worker process: spec -> validator
+
+
+def load_validator(spec: str):
+    """Resolve ``"module:attribute"`` to a pydantic ``TypeAdapter`` or a plain callable."""
+    if spec not in _validators:
+        module, _, attribute = spec.partition(":")
+        _validators[spec] = getattr(importlib.import_module(module), attribute)
+    return _validators[spec]
+
+
+def _error_details(exc):
+    errors = getattr(exc, "errors", None)
+    if callable(errors):  # pydantic ValidationError
+        return [{"path": ".".join(map(str, e["loc"])), "msg": e["msg"]}
+                for e in errors(include_url=False, include_input=False)]
+    return [{"path": "", "msg": str(exc)}]
+
+
+def validate_batch(batch, spec: str = DEFAULT_VALIDATOR):
+    """Validate ``[(line_no, raw_bytes), ...]``; returns ``[(line_no, errors), ...]`` for failures."""
+    validator = load_validator(spec)
+    validate = getattr(validator, "validate_json", validator)
+    failures = []
+    for line_no, raw in batch:
+        try:
+            validate(raw)
+        except Exception as e:  # ValidationError and ValueError are both reported, never fatal
+            failures.append((line_no, _error_details(e)))
+    return failures
+
+
+def read_batches(path: str, batch_size: int):
+    """Stream ``(line_no, raw_bytes)`` batches; blank lines are skipped."""
+    batch = []
+    with open(path, "rb") as f:
+        for line_no, raw in enumerate(f, 1):
+            if raw.strip():
+                batch.append((line_no, raw))
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+    if batch:
+        yield batch
+
+
+def validate_archive(path: str, report_path: str = None, workers: int = None,
+                     batch_size: int = 2000, spec: str = DEFAULT_VALIDATOR) -> dict:
+    """Validate every record of a JSONL archive; returns summary counts and throughput."""
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    records = invalid = 0
+    report = open(report_path, "w") if report_path else None
+    try:
+        with ProcessPoolExecutor(workers) as pool:
+            # Keep a bounded number of batches in flight so memory stays flat
+            # (Executor.map would read the whole file up front).
+            pending = deque()
+            for batch in read_batches(path, batch_size):
+                records += len(batch)
+                pending.append(pool.submit(validate_batch, batch, spec))
+                if len(pending) >= workers * 2:
+                    invalid += _drain(pending.popleft(), report)
+            while pending:
+                invalid += _drain(pending.popleft(), report)
+    finally:
+        if report:
+            report.close()
+    elapsed = time.perf_counter() - started
+    return {"records": records, "invalid": invalid, "seconds": round(elapsed, 3),
+            "records_per_second": round(records / elapsed) if elapsed else records}
+
+
+def _drain(future, report):
+    failures = future.result()
+    if report:
+        for line_no, errors in failures:
+            report.write(json.dumps({"line": line_no, "errors": errors}, separators=(",", ":")) + "\n")
+    return len(failures)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate a JSONL archive of A2A messages.")
+    parser.add_argument("archive")
+    parser.add_argument("--report", help="write failures here as JSONL")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--validator", default=DEFAULT_VALIDATOR,
+                        help="module:attribute of a TypeAdapter or callable (default: %(default)s)")
+    args = parser.parse_args(argv)
+    summary = validate_archive(args.archive, args.report, args.workers, args.batch_size, args.validator)
+    print(json.dumps(summary))
+    return 1 if summary["invalid"] else 0
+
+
+def test_validate_archive():
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = os.path.join(tmp, "archive.jsonl")
+        report = os.path.join(tmp, "errors.jsonl")
+        with open(archive, "w") as f:
+            for i in range(1, 101):
+                f.write("{not json\n" if i in (7, 58) else json.dumps({"role": "user", "n": i}) + "\n")
+            f.write("\n")
+        summary = validate_archive(archive, report, workers=2, batch_size=10, spec="json:loads")
+        assert summary["records"] == 100 and summary["invalid"] == 2
+        with open(report) as f:
+            assert [json.loads(line)["line"] for line in f] == [7, 58]
+
+        # The default validator: one valid A2A message, then one whose second part has a non-string text.
+        with open(archive, "w") as f:
+            f.write('{"role": "user", "parts": [{"type": "text", "text": "hello"}]}\n')
+            f.write('{"role": "user", "parts": [{"type": "text", "text": "ok"}, {"type": "text", "text": 5}]}\n')
+        summary = validate_archive(archive, report, workers=1)
+        assert summary["records"] == 2 and summary["invalid"] == 1
+        with open(report) as f:
+            failures = [json.loads(line) for line in f]
+        assert [failure["line"] for failure in failures] == [2]
+        assert [error["path"] for error in failures[0]["errors"]] == ["parts.1.text.text"]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
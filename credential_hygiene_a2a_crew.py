@@ -3,21 +3,14 @@ Mitigation Example 8: Continuous Auditing & Credential Hygiene (A2A + Google Gen
 Shows how to rotate credentials and maintain secure authentication info.
 """
 import os
+from crew_support import LazyCrew
 import secrets
 from samples.python.common.types import AuthenticationInfo
-from crewai import Agent, Crew, LLM, Task
-from crewai.process import Process
-from dotenv import load_dotenv
-from google import genai
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("credential_hygiene")
 
-def get_api_key():
-    load_dotenv()
-    return os.getenv("GOOGLE_API_KEY")
-
 def rotate_credential(key: str):
     new_value = secrets.token_hex(16)
     os.environ[key] = new_value
@@ -29,29 +22,13 @@ def audit_credential(key: str):
         raise EnvironmentError(f"Credential {key} missing!")
     return val
 
-class CredentialHygieneAgent:
-    def __init__(self):
-        self.llm = LLM(model="gemini/gemini-2.0-flash", api_key=get_api_key())
-        self.agent = Agent(
-            role="Credential Auditor",
-            goal="Rotate and audit credentials for secure authentication.",
-            backstory="You are a security agent that manages credential hygiene.",
-            verbose=False,
-            allow_delegation=False,
-            tools=[],
-            llm=self.llm,
-        )
-        self.task = Task(
-            description="Rotate and audit credentials for secure operations.",
-            expected_output="Credentials are rotated and validated.",
-            agent=self.agent,
-        )
-        self.crew = Crew(
-            agents=[self.agent],
-            tasks=[self.task],
-            process=Process.sequential,
-            verbose=False,
-        )
+class CredentialHygieneAgent(LazyCrew):
+    role = "Credential Auditor"
+    goal = "Rotate and audit credentials for secure authentication."
+    backstory = "You are a security agent that manages credential hygiene."
+    task_description = "Rotate and audit credentials for secure operations."
+    expected_output = "Credentials are rotated and validated."
+
     def hygiene(self, key):
         old = rotate_credential(key)
         assert audit_credential(key) == old
@@ -0,0 +1,137 @@
+"""
+Lazy CrewAI plumbing shared by the ``*_a2a_crew.py`` agents.
+Mitigates: DoS (slow cold starts and per-request agent setup)
+MAESTRO Layers: 3 (Agent Frameworks), 4 (Deployment & Infrastructure)
+
+The deterministic checks the agents expose (``validate``, ``check``,
+``verify``, ...) never touch the LLM, so ``LazyCrew`` builds its ``llm``,
+``agent``, ``task`` and ``crew`` on first attribute access, and ``crewai``
+is only imported then. ``.env`` is read once per process, and LLM clients
+are pooled per model and API key, so every agent instance in the process
+shares one.
+"""
+import functools
+import os
+from threading import Lock
+
+DEFAULT_MODEL = "gemini/gemini-2.0-flash"
+
+
+@functools.lru_cache(maxsize=None)
+def load_env() -> bool:
+    """Load ``.env`` into the environment on the first call only."""
+    from dotenv import load_dotenv
+    return load_dotenv()
+
+
+def get_api_key():
+    load_env()
+    return os.getenv("GOOGLE_API_KEY")
+
+
+class LLMPool:
+    """One LLM client per ``(model, api_key)``, created on first request."""
+
+    def __init__(self, factory=None):
+        self._factory = factory  # defaults to crewai.LLM, imported on first use
+        self._llms = {}
+        self._lock = Lock()
+
+    def get(self, model: str = DEFAULT_MODEL, api_key: str = None):
+        if api_key is None:
+            api_key = get_api_key()
+        with self._lock:
+            llm = self._llms.get((model, api_key))
+            if llm is None:
+                factory = self._factory
+                if factory is None:
+                    from crewai import LLM as factory
+                llm = self._llms[(model, api_key)] = factory(model=model, api_key=api_key)
+            return llm
+
+    def clear(self):
+        """Drop pooled clients, e.g. after rotating the API key."""
+        with self._lock:
+            self._llms.clear()
+
+
+LLM_POOL = LLMPool()
+
+
+class LazyCrew:
+    """Base for the crew agents: ``llm``, ``agent``, ``task`` and ``crew`` are built on first use.
+
+    Subclasses set ``role``, ``goal``, ``backstory``, ``task_description`` and
+    ``expected_output``.
+    """
+
+    model = DEFAULT_MODEL
+    llm_pool = LLM_POOL
+    role = goal = backstory = task_description = expected_output = None
+
+    @functools.cached_property
+    def llm(self):
+        return self.llm_pool.get(self.model)
+
+    @functools.cached_property
+    def agent(self):
+        from crewai import Agent
+        return Agent(
+            role=self.role,
+            goal=self.goal,
+            backstory=self.backstory,
+            verbose=False,
+            allow_delegation=False,
+            tools=[],
+            llm=self.llm,
+        )
+
+    @functools.cached_property
+    def task(self):
+        from crewai import Task
+        return Task(
+            description=self.task_description,
+            expected_output=self.expected_output,
+            agent=self.agent,
+        )
+
+    @functools.cached_property
+    def crew(self):
+        from crewai import Crew
+        from crewai.process import Process
+        return Crew(
+            agents=[self.agent],
+            tasks=[self.task],
+            process=Process.sequential,
+            verbose=False,
+        )
+
+
+def test_lazy_crew():
+    import sys
+    created = []
+    pool = LLMPool(factory=lambda **options: created.append(options) or object())
+
+    class Checker(LazyCrew):
+        llm_pool = pool
+        role = "Checker"
+
+        def check(self, value):
+            return value == "ok"
+
+    imported = "crewai" in sys.modules
+    first, second = Checker(), Checker()
+    assert first.check("ok") and not second.check("bad")
+    assert ("crewai" in sys.modules) == imported and created == []  # nothing built for plain checks
+    assert first.llm is second.llm and len(created) == 1
+    assert created[0]["model"] == DEFAULT_MODEL
+    pool.clear()
+    assert Checker().llm is not first.llm and len(created) == 2
+    get_api_key()
+    get_api_key()
+    assert load_env.cache_info().misses == 1
+
+
+if __name__ == "__main__":
+    test_lazy_crew()
+    print("Lazy crew support ran successfully.")
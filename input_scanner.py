@@ -0,0 +1,150 @@
+"""
+Batch scanning of A2A message parts for unsafe input patterns.
+Mitigates: Prompt Injection, Message Schema Violation
+MAESTRO Layers: 2 (Data Operations), 1 (Foundation Models)
+
+A gateway that validates the whole conversation history on every turn calls
+``scan_messages`` once per batch. The text parts of the batch are joined into
+one buffer and screened there, so the per-part interpreter overhead is paid
+once per batch instead of once per pattern per part. (For a handful of
+literals CPython's substring search is faster than a regex alternation, so
+the screen uses ``in``.) Only a batch that fails the screen gets one regex
+pass for all patterns, and each finding is mapped back to its message, part
+and offset.
+"""
+import re
+from bisect import bisect_right
+from typing import NamedTuple
+
+DEFAULT_UNSAFE_PATTERNS = ("<", ">", "{{", "}}")
+_SEPARATOR = "\0"
+
+
+class PartFinding(NamedTuple):
+    part_index: int
+    pattern: str
+    offset: int
+
+
+class MessageVerdict(NamedTuple):
+    message_index: int
+    safe: bool
+    findings: tuple
+
+
+class BatchVerdict:
+    """Verdicts for a batch of messages, stored sparsely since most are safe.
+
+    ``verdicts[i]`` (or iteration) gives a ``MessageVerdict`` per message.
+    """
+
+    def __init__(self, count: int, findings: dict):
+        self._count = count
+        self._findings = findings
+
+    @property
+    def safe(self) -> bool:
+        return not self._findings
+
+    @property
+    def unsafe(self):
+        """Indices of the messages that contain unsafe parts."""
+        return sorted(self._findings)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if not -self._count <= index < self._count:
+            raise IndexError(index)
+        index %= self._count
+        findings = self._findings.get(index, ())
+        return MessageVerdict(index, not findings, findings)
+
+    def __iter__(self):
+        return (self[i] for i in range(self._count))
+
+
+class UnsafePatternScanner:
+    """Compiled set of unsafe literal patterns, e.g. markup or template delimiters."""
+
+    def __init__(self, patterns=DEFAULT_UNSAFE_PATTERNS, extra=()):
+        self.version = 0
+        self._compile(tuple(patterns) + tuple(extra))
+
+    def _compile(self, patterns):
+        patterns = tuple(dict.fromkeys(p for p in patterns if p))
+        if any(_SEPARATOR in p for p in patterns):
+            raise ValueError("Unsafe patterns must not contain NUL")
+        single = "".join(re.escape(p) for p in patterns if len(p) == 1)
+        alternatives = [re.escape(p) for p in sorted(patterns, key=len, reverse=True) if len(p) > 1]
+        if single:
+            alternatives.append(f"[{single}]")
+        self.patterns = patterns
+        self._regex = re.compile("|".join(alternatives) or "(?!)")
+
+    def reload(self, patterns):
+        """Replace the pattern list; bumps ``version`` so cached verdicts are dropped."""
+        self._compile(tuple(patterns))
+        self.version += 1
+
+    def is_unsafe(self, text: str) -> bool:
+        for pattern in self.patterns:
+            if pattern in text:
+                return True
+        return False
+
+    def find(self, text: str):
+        """Return ``(pattern, offset)`` for every unsafe pattern in ``text``."""
+        return [(m.group(), m.start()) for m in self._regex.finditer(text)]
+
+    def scan_messages(self, messages) -> BatchVerdict:
+        """Scan many messages at once and return per-message, per-part verdicts.
+
+        Never raises on unsafe input: every unsafe part is reported as a
+        ``PartFinding`` with the pattern found and its offset in the part's text.
+        """
+        texts = [text for message in messages for part in message.parts
+                 if isinstance(text := getattr(part, "text", None), str)]
+        joined = _SEPARATOR.join(texts)
+        if not self.is_unsafe(joined):
+            return BatchVerdict(len(messages), {})
+        starts, owners, position = [], [], 0
+        for message_index, message in enumerate(messages):
+            for part_index, part in enumerate(message.parts):
+                text = getattr(part, "text", None)
+                if isinstance(text, str):
+                    starts.append(position)
+                    owners.append((message_index, part_index))
+                    position += len(text) + 1
+        findings = {}
+        for match in self._regex.finditer(joined):
+            slot = bisect_right(starts, match.start()) - 1
+            message_index, part_index = owners[slot]
+            finding = PartFinding(part_index, match.group(), match.start() - starts[slot])
+            findings[message_index] = findings.get(message_index, ()) + (finding,)
+        return BatchVerdict(len(messages), findings)
+
+
+def test_unsafe_pattern_scanner():
+    from types import SimpleNamespace as Obj
+
+    def message(*texts):
+        return Obj(parts=[Obj(text=t) for t in texts] + [Obj(data={"k": "<"})])
+
+    scanner = UnsafePatternScanner(extra=("ignore previous",))
+    history = [message("Hello, world!"), message("fine", "<script>"), message("{{x}} and ignore previous")]
+    verdicts = scanner.scan_messages(history)
+    assert not verdicts.safe and verdicts.unsafe == [1, 2] and len(verdicts) == 3
+    assert verdicts[0] == MessageVerdict(0, True, ())
+    assert verdicts[1].findings == (PartFinding(1, "<", 0), PartFinding(1, ">", 7))
+    assert [f.pattern for f in verdicts[2].findings] == ["{{", "}}", "ignore previous"]
+    assert verdicts[2].findings[2].offset == 10
+    assert scanner.is_unsafe("a }} b") and not scanner.is_unsafe("a } b")
+    scanner.reload(["<"])
+    assert scanner.version == 1 and scanner.scan_messages([message("{{")]).safe
+
+
+if __name__ == "__main__":
+    test_unsafe_pattern_scanner()
+    print("Unsafe pattern scanner ran successfully.")
@@ -4,16 +4,36 @@ Mitigates: Message Schema Violation, Prompt Injection
 MAESTRO Layers: 2 (Data Operations), 1 (Foundation Models)
 """
 from common.types import Message, TextPart
+from input_scanner import BatchVerdict, UnsafePatternScanner
+from metrics import instrument
+from verdict_cache import VerdictCache
 
-def sanitize_message_parts(message: Message) -> Message:
-    """Sanitize all TextParts in a Message before processing or sending."""
+UNSAFE_PATTERNS = UnsafePatternScanner(("<", ">"))
+
+@instrument("input_validation")
+def sanitize_message_parts(message: Message, unsafe: UnsafePatternScanner = UNSAFE_PATTERNS,
+                           cache: VerdictCache = None) -> Message:
+    """Sanitize all TextParts in a Message before processing or sending.
+
+    Pass a ``VerdictCache`` to skip parts already checked on an earlier turn.
+    """
     for part in message.parts:
         if isinstance(part, TextPart):
-            if "<" in part.text or ">" in part.text:
+            if cache is None:
+                flagged = unsafe.is_unsafe(part.text)
+            else:
+                flagged = cache.check(unsafe, part.text, unsafe.is_unsafe)
+            if flagged:
                 raise ValueError("Input contains potentially unsafe characters")
     return message
 
+def sanitize_messages(messages: list[Message], unsafe: UnsafePatternScanner = UNSAFE_PATTERNS) -> BatchVerdict:
+    """Check a whole conversation history in one scan; reports unsafe parts instead of raising."""
+    return unsafe.scan_messages(messages)
+
 # Example usage:
 if __name__ == "__main__":
     msg = Message(role="user", parts=[TextPart(text="Hello, world!")])
     sanitize_message_parts(msg)
+    verdicts = sanitize_messages([msg, Message(role="user", parts=[TextPart(text="<b>hi</b>")])])
+    assert verdicts.unsafe == [1]
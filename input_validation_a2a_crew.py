@@ -3,66 +3,65 @@ Mitigation Example 1: Input Validation & Sanitization (A2A + Google GenAI + Crew
 Prevents message schema violations and prompt injection by validating and sanitizing message parts using A2A types, CrewAI, and Google GenAI.
 """
 from samples.python.common.types import Message, TextPart
-from crewai import Agent, Crew, LLM, Task
-from crewai.process import Process
-from dotenv import load_dotenv
-import os
-from google import genai
+from crew_support import LazyCrew
 import logging
+from input_scanner import UnsafePatternScanner
+from metrics import instrument
+from verdict_cache import shared_verdicts
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("input_validation")
 
-def get_api_key():
-    load_dotenv()
-    return os.getenv("GOOGLE_API_KEY")
+# Default patterns are "<", ">", "{{" and "}}"; pass extra=(...) to add more.
+UNSAFE_PATTERNS = UnsafePatternScanner()
 
-def sanitize_message_parts(message: Message) -> Message:
+@instrument("input_validation")
+def sanitize_message_parts(message: Message, unsafe: UnsafePatternScanner = UNSAFE_PATTERNS, cache=None) -> Message:
     for part in message.parts:
         if isinstance(part, TextPart):
             # Use a simple check for prompt injection
-            if "<" in part.text or ">" in part.text or "{{" in part.text or "}}" in part.text:
+            if cache is None:
+                flagged = unsafe.is_unsafe(part.text)
+            else:
+                flagged = cache.check(unsafe, part.text, unsafe.is_unsafe)
+            if flagged:
                 raise ValueError("Input contains potentially unsafe characters")
     return message
 
-class InputValidationAgent:
-    def __init__(self):
-        self.llm = LLM(model="gemini/gemini-2.0-flash", api_key=get_api_key())
-        self.agent = Agent(
-            role="Input Validator",
-            goal="Ensure all incoming messages are sanitized and safe for LLM processing.",
-            backstory="You are a security-focused AI agent that validates user input for safety before passing to LLMs.",
-            verbose=False,
-            allow_delegation=False,
-            tools=[],
-            llm=self.llm,
-        )
-        self.task = Task(
-            description="Validate and sanitize the user message: '{user_message}'",
-            expected_output="A sanitized Message object or an error if unsafe input is detected.",
-            agent=self.agent,
-        )
-        self.crew = Crew(
-            agents=[self.agent],
-            tasks=[self.task],
-            process=Process.sequential,
-            verbose=False,
-        )
+def sanitize_messages(messages, unsafe: UnsafePatternScanner = UNSAFE_PATTERNS):
+    return unsafe.scan_messages(messages)
+
+class InputValidationAgent(LazyCrew):
+    role = "Input Validator"
+    goal = "Ensure all incoming messages are sanitized and safe for LLM processing."
+    backstory = "You are a security-focused AI agent that validates user input for safety before passing to LLMs."
+    task_description = "Validate and sanitize the user message: '{user_message}'"
+    expected_output = "A sanitized Message object or an error if unsafe input is detected."
+
     def validate(self, user_message):
         msg = Message(role="user", parts=[TextPart(text=user_message)])
         try:
-            sanitized = sanitize_message_parts(msg)
+            sanitized = sanitize_message_parts(msg, cache=shared_verdicts)
             logger.info("Message sanitized: %s", sanitized)
             return sanitized
         except ValueError as e:
             logger.error("Sanitization failed: %s", e)
             return str(e)
+    def validate_history(self, user_messages):
+        history = [Message(role="user", parts=[TextPart(text=m)]) for m in user_messages]
+        verdicts = sanitize_messages(history)
+        for index in verdicts.unsafe:
+            logger.error("Sanitization failed for message %d: %s", index, verdicts[index].findings)
+        return verdicts
 
 def test_input_validation_agent():
     agent = InputValidationAgent()
     assert isinstance(agent.validate("Hello, world!"), Message)
     result = agent.validate("<script>alert(1)</script>")
     assert "unsafe characters" in result
+    verdicts = agent.validate_history(["Hello", "{{system}}", "fine"])
+    assert verdicts.unsafe == [1]
+    assert verdicts[1].findings[0].pattern == "{{"
 
 if __name__ == "__main__":
     test_input_validation_agent()
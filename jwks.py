@@ -0,0 +1,166 @@
+"""
+JWKS key set indexed by ``kid`` for JWT validation with key rotation.
+Mitigates: Server Impersonation, Agent Card Spoofing, Cross-Agent Task Escalation
+MAESTRO Layers: 3 (Agent Frameworks), 4 (Deployment & Infrastructure), 7 (Agent Ecosystem)
+
+The identity provider publishes its signing keys as a JWKS document. Keys are
+parsed once and looked up by the token header's ``kid``, so a token is
+verified against exactly one key, never tried against each in turn. The set
+is refreshed in the background; a request never waits for that. A ``kid``
+that is not in the set (a key that was just rotated in) triggers an immediate
+refetch, at most once per ``min_refetch_interval``, so forged ``kid`` values
+cannot be used to hammer the JWKS endpoint.
+"""
+import json
+import logging
+import threading
+import time
+from urllib.request import urlopen
+
+from jose import jwk
+
+logger = logging.getLogger("jwks")
+
+
+def parse_jwks(document: dict) -> dict:
+    """Return ``{kid: key}`` for the signing keys of a JWKS document."""
+    keys = {}
+    for entry in document.get("keys", []):
+        kid = entry.get("kid")
+        if kid is None or entry.get("use", "sig") != "sig":
+            continue
+        try:
+            keys[kid] = jwk.construct(entry, entry.get("alg", "RS256"))
+        except Exception as e:  # one malformed key must not take down the whole set
+            logger.warning("Skipping JWKS key %r: %s", kid, e)
+    return keys
+
+
+class JWKSKeySet:
+    """Signing keys loaded from a JWKS file path or ``http(s)://`` URL."""
+
+    def __init__(self, source: str, refresh_interval: float = 300.0,
+                 min_refetch_interval: float = 30.0, timeout: float = 5.0, clock=time.monotonic):
+        self.source = source
+        self.refresh_interval = refresh_interval
+        self.min_refetch_interval = min_refetch_interval
+        self.timeout = timeout
+        self.version = 0
+        self._clock = clock
+        self._keys = {}  # replaced wholesale on refresh, so readers need no lock
+        self._last_fetch = None
+        self._fetch_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _fetch(self) -> dict:
+        if self.source.startswith(("http://", "https://")):
+            with urlopen(self.source, timeout=self.timeout) as response:
+                return json.load(response)
+        with open(self.source) as f:
+            return json.load(f)
+
+    def refresh(self, min_age: float = None):
+        """Fetch and swap in the current key set; on failure the old keys stay in use.
+
+        With ``min_age``, skip the fetch if the last one is more recent than
+        that; concurrent callers then share a single fetch.
+        """
+        with self._fetch_lock:
+            last = self._last_fetch
+            if min_age is not None and last is not None and self._clock() - last < min_age:
+                return
+            self._last_fetch = self._clock()
+            keys = parse_jwks(self._fetch())
+            if not keys:
+                raise ValueError("JWKS document contains no signing keys")
+            self._keys = keys
+            self.version += 1
+
+    def get(self, kid):
+        """Return the key for ``kid``, refetching (rate limited) when it is unknown."""
+        key = self._keys.get(kid)
+        if key is not None or kid is None:
+            return key
+        try:
+            self.refresh(min_age=self.min_refetch_interval)
+        except Exception as e:
+            logger.warning("JWKS refetch for unknown kid %r failed: %s", kid, e)
+        return self._keys.get(kid)
+
+    @property
+    def kids(self):
+        return set(self._keys)
+
+    def start(self):
+        """Load the keys now, then keep refreshing them on a daemon thread."""
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="jwks-refresh", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning("JWKS refresh from %s failed: %s", self.source, e)
+
+
+def test_jwks_key_set():
+    from functools import partial
+    from http.server import HTTPServer, SimpleHTTPRequestHandler
+    import os
+    import tempfile
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    def public_jwk(kid):
+        private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        pem = private.public_key().public_bytes(serialization.Encoding.PEM,
+                                                serialization.PublicFormat.SubjectPublicKeyInfo)
+        return dict(jwk.construct(pem, "RS256").to_dict(), kid=kid, use="sig")
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    now = [0.0]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jwks.json")
+        with open(path, "w") as f:
+            json.dump({"keys": [public_jwk("k1"), {"kid": "enc", "use": "enc", "kty": "RSA"}]}, f)
+        server = HTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=tmp))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/jwks.json"
+            keys = JWKSKeySet(url, min_refetch_interval=30, clock=lambda: now[0]).start()
+            assert keys.kids == {"k1"} and keys.get("k1") is not None
+            # Rotation: k2 appears; the first unknown lookup refetches.
+            with open(path, "w") as f:
+                json.dump({"keys": [public_jwk("k1"), public_jwk("k2")]}, f)
+            now[0] = 31.0
+            assert keys.get("k2") is not None and keys.version == 2
+            # Unknown kids are refetched at most once per min_refetch_interval.
+            assert keys.get("forged") is None and keys.version == 2
+            now[0] = 62.0
+            assert keys.get("forged") is None and keys.version == 3
+            keys.stop()
+            from_file = JWKSKeySet(path)
+            from_file.refresh()
+            assert from_file.get("k2") is not None
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    test_jwks_key_set()
+    print("JWKS key set ran successfully.")
@@ -0,0 +1,225 @@
+"""
+Verified-token cache and pre-parsed public keys for JWT validation.
+Mitigates: DoS (repeated RSA work), Cross-Agent Task Escalation
+MAESTRO Layers: 3 (Agent Frameworks), 4 (Deployment & Infrastructure)
+
+Clients reuse the same bearer token for many calls. Once a token has been
+verified, its claims are cached under a SHA-256 digest of the token (the
+token itself is never stored) until the token expires. Repeat requests then
+skip signature verification entirely. Revoking a token or a ``jti`` takes
+effect immediately, cached or not. Cached claims are stored as a read-only
+snapshot and every hit gets its own plain ``dict`` copy, like a fresh
+``jwt.decode``, so a caller cannot alter what later requests with the same
+token are authorized by.
+
+``TOKEN_CACHE`` is the process-wide instance, reported to ``metrics`` as
+``jwt_tokens``.
+"""
+import hashlib
+import json
+import time
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+from types import MappingProxyType
+
+from jose import jwk
+
+from metrics import METRICS
+
+
+@lru_cache(maxsize=64)
+def load_public_key(pem, algorithm: str = "RS256"):
+    """Parse a PEM/JWK public key once; ``jwt.decode`` accepts the parsed key object."""
+    return jwk.construct(pem, algorithm)
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+_KEY_FINGERPRINTS = weakref.WeakKeyDictionary()  # parsed key object -> fingerprint
+
+
+def _fingerprint(material) -> bytes:
+    if isinstance(material, str):
+        material = material.encode()
+    elif not isinstance(material, bytes):
+        material = json.dumps(material, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(material).digest()
+
+
+def _key_identity(key):
+    # PEM strings and bytes compare by value. JWK dicts and parsed key objects
+    # are keyed on a digest of their canonical form (sorted JSON, or the
+    # object's PEM), so two equal keys share entries and a rotated key never
+    # inherits another key's verified tokens through a reused ``id``.
+    if isinstance(key, (str, bytes)):
+        return key
+    if isinstance(key, dict):
+        return _fingerprint(key)
+    fingerprint = _KEY_FINGERPRINTS.get(key)
+    if fingerprint is None:
+        fingerprint = _fingerprint(key.to_pem() if hasattr(key, "to_pem") else key.to_dict())
+        _KEY_FINGERPRINTS[key] = fingerprint
+    return fingerprint
+
+
+def _freeze(value):
+    """Read-only deep copy of decoded JSON claims: dicts become mapping proxies, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    """Plain ``dict``/``list`` copy of frozen claims, equal to what ``jwt.decode`` returned."""
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified claims.
+
+    Each entry expires at the token's ``exp`` or after ``default_ttl``,
+    whichever comes first, and is not served before ``nbf``.
+
+    ``revocation_hooks`` are callables ``(claims) -> bool``; a token is
+    treated as revoked when any of them returns True. They run on every
+    validation, so keep them cheap (e.g. a set lookup).
+    """
+
+    def __init__(self, max_entries: int = 10_000, default_ttl: float = 300.0, clock=time.time):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.revocation_hooks = []
+        self._clock = clock
+        self._entries = OrderedDict()  # (digest, key, audience) -> (claims, not_before, expires)
+        self._revoked_tokens = {}  # digest -> expiry
+        self._revoked_jtis = {}  # jti -> expiry
+        self._lock = Lock()
+        self.hits = self.misses = 0
+
+    def get(self, token: str, key, audience):
+        """Return cached claims for a token verified with ``key`` for ``audience``, or ``None``.
+
+        The claims are a fresh ``dict`` copied from the snapshot taken by ``put``.
+        """
+        digest = token_digest(token)
+        cache_key = (digest, _key_identity(key), audience)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None or not entry[1] <= now < entry[2]:
+                if entry is not None:
+                    del self._entries[cache_key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+        claims = entry[0]
+        if self.is_revoked(token, claims, digest):
+            self.invalidate(token)
+            return None
+        with self._lock:
+            self.hits += 1
+        return _thaw(claims)
+
+    def put(self, token: str, key, audience, claims: dict):
+        cache_key = (token_digest(token), _key_identity(key), audience)
+        claims = _freeze(claims)
+        now = self._clock()
+        expires = claims.get("exp", now + self.default_ttl)
+        not_before = claims.get("nbf", now)
+        with self._lock:
+            self._entries[cache_key] = (claims, not_before, min(expires, now + self.default_ttl))
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def is_revoked(self, token: str, claims: dict, digest: bytes = None) -> bool:
+        digest = digest or token_digest(token)
+        if digest in self._revoked_tokens or claims.get("jti") in self._revoked_jtis:
+            return True
+        return any(hook(claims) for hook in self.revocation_hooks)
+
+    def invalidate(self, token: str):
+        digest = token_digest(token)
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] == digest]:
+                del self._entries[cache_key]
+
+    def revoke(self, token: str, expires: float = None):
+        """Reject ``token`` from now on (until ``expires``, default: one day)."""
+        self._prune_revocations()
+        self._revoked_tokens[token_digest(token)] = expires or self._clock() + 86400
+        self.invalidate(token)
+
+    def revoke_jti(self, jti: str, expires: float = None):
+        self._prune_revocations()
+        self._revoked_jtis[jti] = expires or self._clock() + 86400
+        with self._lock:
+            for cache_key in [k for k, v in self._entries.items() if v[0].get("jti") == jti]:
+                del self._entries[cache_key]
+
+    def _prune_revocations(self):
+        # Once a revoked token has expired it is rejected anyway, so forget it.
+        now = self._clock()
+        for revoked in (self._revoked_tokens, self._revoked_jtis):
+            for item in [k for k, expiry in revoked.items() if expiry <= now]:
+                del revoked[item]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Verified claims by token digest; TOKEN_CACHE.revoke(token) / revoke_jti(jti) take effect immediately.
+TOKEN_CACHE = VerifiedTokenCache()
+METRICS.track_cache("jwt_tokens", TOKEN_CACHE)
+
+
+def test_verified_token_cache():
+    now = [1000.0]
+    cache = VerifiedTokenCache(max_entries=2, clock=lambda: now[0])
+    claims = {"sub": "agent-a", "exp": 1060, "jti": "t1", "roles": ["reader"]}
+    assert cache.get("tok-a", "pem", "aud") is None
+    cache.put("tok-a", "pem", "aud", claims)
+    claims["roles"].append("admin")  # the caller's dict is not the cached copy
+    cached = cache.get("tok-a", "pem", "aud")
+    assert cached == {"sub": "agent-a", "exp": 1060, "jti": "t1", "roles": ["reader"]}
+    assert type(cached) is dict and json.loads(json.dumps(cached)) == cached
+    cached["roles"].append("admin")  # each hit gets its own copy
+    cached["sub"] = "agent-z"
+    assert cache.get("tok-a", "pem", "aud") == {"sub": "agent-a", "exp": 1060, "jti": "t1", "roles": ["reader"]}
+    assert cache.get("tok-a", "other-pem", "aud") is None
+    assert cache.get("tok-a", "pem", "other-aud") is None
+    now[0] = 1060.0  # expired at exp
+    assert cache.get("tok-a", "pem", "aud") is None and len(cache) == 0
+
+    now[0] = 1000.0
+    cache.put("tok-a", "pem", "aud", claims)
+    cache.revoke_jti("t1", expires=1060)
+    assert cache.get("tok-a", "pem", "aud") is None
+    assert cache.is_revoked("tok-a", claims)
+    cache.put("tok-b", "pem", "aud", {"sub": "agent-b", "exp": 2000})
+    cache.revoke("tok-b")
+    assert cache.get("tok-b", "pem", "aud") is None
+    cache.revocation_hooks.append(lambda c: c.get("sub") == "agent-c")
+    assert cache.is_revoked("tok-c", {"sub": "agent-c"})
+    for i in range(5):
+        cache.put(f"tok-{i}", "pem", "aud", {"exp": 2000})
+    assert len(cache) == 2
+    jwk_a = {"kty": "RSA", "n": "abc", "e": "AQAB"}
+    cache.put("tok-k", jwk_a, "aud", {"exp": 2000})
+    assert cache.get("tok-k", dict(reversed(list(jwk_a.items()))), "aud") is not None
+    assert cache.get("tok-k", {**jwk_a, "n": "xyz"}, "aud") is None
+
+
+if __name__ == "__main__":
+    test_verified_token_cache()
+    print("Verified token cache ran successfully.")
@@ -0,0 +1,178 @@
+"""
+Process-pool offload of JWT signature verification for asyncio servers.
+Mitigates: DoS (event-loop starvation), Cross-Agent Task Escalation
+MAESTRO Layers: 3 (Agent Frameworks), 4 (Deployment & Infrastructure)
+
+RS256 verification is CPU-bound; run inline, it blocks the event loop and
+caps an async A2A server at one core. ``AsyncJWTVerifier`` checks the
+verified-token cache first and sends the rest to a bounded process pool.
+Tokens that arrive within ``batch_window`` of each other are shipped to a
+worker as one batch, so the inter-process round trip is paid once per batch
+instead of once per token; identical tokens in a batch are verified once.
+At most ``max_pending`` verifications are outstanding; further callers wait.
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+
+from jose import jwt
+from jwt_cache import VerifiedTokenCache, load_public_key
+
+
+def _verify_batch(items):
+    """Worker side: verify ``[(token, pem, audience), ...]``; returns ``[(ok, claims_or_error), ...]``."""
+    results = []
+    for token, pem, audience in items:
+        try:
+            key = load_public_key(pem) if isinstance(pem, (str, bytes)) else pem  # JWK dicts are used as-is
+            results.append((True, jwt.decode(token, key, audience=audience, algorithms=['RS256'])))
+        except Exception as e:  # a bad key or token fails only its own item, never the batch
+            results.append((False, f"{type(e).__name__}: {e}"))
+    return results
+
+
+@lru_cache(maxsize=64)
+def _key_pem(key):
+    # Parsed key objects (e.g. from a JWKS key set) are sent to workers as PEM.
+    return key.to_pem()
+
+
+def _picklable(key):
+    # JWK dicts pickle as they are; only hashable key objects go through the cache.
+    return key if isinstance(key, (str, bytes, dict)) else _key_pem(key)
+
+
+def _batch_key(pem):
+    return json.dumps(pem, sort_keys=True) if isinstance(pem, dict) else pem
+
+
+class AsyncJWTVerifier:
+    """Async ``validate_jwt``: cache first, then micro-batched verification in worker processes."""
+
+    def __init__(self, workers: int = None, max_pending: int = 1024, batch_size: int = 32,
+                 batch_window: float = 0.001, cache: VerifiedTokenCache = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.cache = cache
+        self._slots = asyncio.Semaphore(max_pending)
+        self._pool = None  # started on first use
+        self._batch = {}  # (token, key, audience) -> (pem or JWK dict, waiting futures)
+        self._flush_handle = None
+        self.batches = self.offloaded = 0
+
+    async def verify(self, token: str, public_key, audience):
+        """Return the token's claims; raises ``ValueError`` like ``validate_jwt``."""
+        cache = self.cache
+        if cache is not None:
+            claims = cache.get(token, public_key, audience)
+            if claims is not None:
+                return claims
+        async with self._slots:
+            claims = await self._submit(token, _picklable(public_key), audience)
+        if cache is not None:
+            if cache.is_revoked(token, claims):
+                raise ValueError('Token has been revoked')
+            cache.put(token, public_key, audience, claims)
+        return claims
+
+    def _submit(self, token, pem, audience):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch.setdefault((token, _batch_key(pem), audience), (pem, []))[1].append(future)
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._batch = self._batch, {}
+        if not batch:
+            return
+        if self._pool is None:
+            # spawn: forking a process that runs an event loop and helper threads is unsafe.
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        items = [(token, pem, audience) for (token, _, audience), (pem, _) in batch.items()]
+        done = asyncio.get_running_loop().run_in_executor(self._pool, _verify_batch, items)
+        done.add_done_callback(partial(self._resolve, batch))
+        self.batches += 1
+        self.offloaded += len(batch)
+
+    @staticmethod
+    def _resolve(batch, done):
+        error = done.exception() if not done.cancelled() else asyncio.CancelledError()
+        results = done.result() if error is None else [None] * len(batch)
+        for (_, waiters), result in zip(batch.values(), results):
+            for future in waiters:
+                if future.done():  # caller was cancelled
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                elif result[0]:
+                    future.set_result(result[1])
+                else:
+                    future.set_exception(ValueError('Invalid or expired token'))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+def test_async_jwt_verifier():
+    import time
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from jose import jwk
+
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                        serialization.NoEncryption())
+    public_pem = private.public_key().public_bytes(serialization.Encoding.PEM,
+                                                   serialization.PublicFormat.SubjectPublicKeyInfo)
+    exp = int(time.time()) + 600
+    tokens = [jwt.encode({"sub": f"agent-{i}", "aud": "a2a", "exp": exp}, private_pem, algorithm="RS256")
+              for i in range(10)]
+
+    async def run():
+        verifier = AsyncJWTVerifier(workers=2, max_pending=4, batch_size=4, cache=VerifiedTokenCache())
+        try:
+            claims = await asyncio.gather(*(verifier.verify(t, public_pem, "a2a") for t in tokens + tokens[:2]))
+            assert [c["sub"] for c in claims] == [f"agent-{i}" for i in list(range(10)) + [0, 1]]
+            assert verifier.offloaded <= 12 and verifier.batches >= 3
+            offloaded = verifier.offloaded
+            assert (await verifier.verify(tokens[3], public_pem, "a2a"))["sub"] == "agent-3"
+            assert verifier.offloaded == offloaded  # served from the cache
+            try:
+                await verifier.verify(tokens[0][:-4] + "AAAA", public_pem, "a2a")
+                raise AssertionError("tampered token accepted")
+            except ValueError:
+                pass
+            # An unparseable key in the same batch only fails its own caller.
+            verifier.cache = None
+            results = await asyncio.gather(verifier.verify(tokens[4], "bogus", "a2a"),
+                                           verifier.verify(tokens[5], public_pem, "a2a"), return_exceptions=True)
+            assert isinstance(results[0], ValueError) and str(results[0]) == 'Invalid or expired token'
+            assert results[1]["sub"] == "agent-5"
+            # JWK dicts are accepted as validate_jwt accepts them, cached or not.
+            jwk_key = jwk.construct(public_pem, "RS256").to_dict()
+            assert (await verifier.verify(tokens[6], jwk_key, "a2a"))["sub"] == "agent-6"
+            verifier.cache = VerifiedTokenCache()
+            for _ in range(2):
+                assert (await verifier.verify(tokens[7], dict(jwk_key), "a2a"))["sub"] == "agent-7"
+        finally:
+            verifier.close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_async_jwt_verifier()
+    print("Async JWT verifier ran successfully.")
@@ -5,15 +5,34 @@ MAESTRO Layers: 5 (Evaluation & Observability), 6 (Security & Compliance)
 """
 import logging
 from common.types import TaskStatus, TaskState, Message, TextPart
+from audit_pipeline import AuditPipeline
+from audit_store import AuditStore, AuditStoreHandler
+from metrics import instrument
 
-def log_task_status(task_status: TaskStatus):
-    """Log task status safely, preventing log injection from Message parts."""
+logger = logging.getLogger("a2a_observability")
+
+@instrument("audit_logging")
+def log_task_status(task_status: TaskStatus, task_id: str = None, user: str = None):
+    """Log task status safely, preventing log injection from Message parts.
+
+    ``task_id`` and ``user`` are attached to the record so an ``AuditStore``
+    can index it.
+    """
     msg = task_status.message.parts[0].text if task_status.message and task_status.message.parts else ""
     if "\n" in msg or "\r" in msg:
         raise ValueError("Log injection detected")
-    logging.info(f"Task {task_status.state}: {msg}")
+    logger.info("Task %s: %s", task_status.state, msg,  # formatted only if emitted
+                extra={"task_id": task_id, "user": user})
 
 # Example usage:
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    # Records are queued and written in batches by a background thread,
+    # to the console and to an indexed audit store.
+    store = AuditStore("audit-log")
+    audit = AuditPipeline([logging.StreamHandler(), AuditStoreHandler(store)], policy="drop").attach(logger).start()
     status = TaskStatus(state=TaskState.WORKING, message=Message(role="agent", parts=[TextPart(text="Processing")]))
-    log_task_status(status)
+    log_task_status(status, task_id="task-123", user="alice")
+    audit.stop()
+    print(store.query(task_id="task-123"))
+    store.close()
@@ -3,48 +3,32 @@ Mitigation Example 7: Logging & Observability (A2A + Google GenAI + CrewAI)
 Provides safe logging practices to prevent log injection and improve auditability.
 """
 import logging
+from metrics import instrument
 import re
-from crewai import Agent, Crew, LLM, Task
-from crewai.process import Process
-from dotenv import load_dotenv
-import os
-from google import genai
+from crew_support import LazyCrew
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("a2a_observability")
+# Optional: AuditPipeline([logging.FileHandler("audit.log")]).attach(logger).start()
+# moves formatting and disk I/O off the request path (see audit_pipeline.py);
+# add AuditStoreHandler(AuditStore("audit-log")) to query events by task and user.
 
-def get_api_key():
-    load_dotenv()
-    return os.getenv("GOOGLE_API_KEY")
+_LOG_UNSAFE = re.compile(r'[\r\n\x00]')
 
-def safe_log(event: str):
-    clean = re.sub(r'[\r\n\x00]', '', event)
-    logger.info(f"Audit event: {clean}")
+@instrument("audit_logging")
+def safe_log(event: str, task_id: str = None, user: str = None):
+    # Most events are clean; only run the substitution when a control character is present.
+    clean = _LOG_UNSAFE.sub('', event) if '\n' in event or '\r' in event or '\x00' in event else event
+    logger.info("Audit event: %s", clean, extra={"task_id": task_id, "user": user})
     return clean
 
-class LoggingObservabilityAgent:
-    def __init__(self):
-        self.llm = LLM(model="gemini/gemini-2.0-flash", api_key=get_api_key())
-        self.agent = Agent(
-            role="Audit Logger",
-            goal="Log all events safely and provide observability.",
-            backstory="You are a logging agent that ensures safe, auditable logs.",
-            verbose=False,
-            allow_delegation=False,
-            tools=[],
-            llm=self.llm,
-        )
-        self.task = Task(
-            description="Log the event in a safe, observable way.",
-            expected_output="Event is logged without injection risk.",
-            agent=self.agent,
-        )
-        self.crew = Crew(
-            agents=[self.agent],
-            tasks=[self.task],
-            process=Process.sequential,
-            verbose=False,
-        )
+class LoggingObservabilityAgent(LazyCrew):
+    role = "Audit Logger"
+    goal = "Log all events safely and provide observability."
+    backstory = "You are a logging agent that ensures safe, auditable logs."
+    task_description = "Log the event in a safe, observable way."
+    expected_output = "Event is logged without injection risk."
+
     def log(self, event):
         return safe_log(event)
 
@@ -0,0 +1,209 @@
+"""
+Latency histograms and counters for the mitigation hot paths, exported as Prometheus text.
+Mitigates: Insider Threats, Cross-Layer Attacks, DoS (unseen latency regressions)
+MAESTRO Layers: 4 (Deployment & Infrastructure), 5 (Evaluation & Observability)
+
+``@instrument("name")`` records, per mitigation, a latency histogram, a
+call counter and rejections by reason (the exception's ``reason`` attribute
+or its class name). Cache hit rates are read from the caches' own ``hits`` /
+``misses`` counters at export time, so they add nothing to the hot path.
+
+Set ``A2A_METRICS=0`` before import and ``instrument`` returns functions
+unwrapped, at zero cost; ``METRICS.enabled = False`` switches recording off
+at runtime for the price of one attribute check per call.
+"""
+import bisect
+import functools
+import inspect
+import os
+import threading
+import time
+from threading import Lock
+
+# Seconds; the hot paths are mostly microseconds, network-bound ones milliseconds.
+BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3,
+           2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0)
+
+
+class Histogram:
+    """Per-thread bucket counts, merged on export, so ``observe`` takes no lock."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []  # one [bucket counts..., +Inf count, sum] per thread
+        self._lock = Lock()
+
+    def observe(self, value: float, _bucket=functools.partial(bisect.bisect_left, BUCKETS)):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = [0] * (len(BUCKETS) + 1) + [0.0]
+            with self._lock:
+                self._shards.append(shard)
+        shard[_bucket(value)] += 1
+        shard[-1] += value
+
+    def snapshot(self):
+        """Return ``(bucket counts incl. +Inf, sum)`` over all threads."""
+        with self._lock:
+            shards = [list(shard) for shard in self._shards]
+        counts = [sum(column) for column in zip(*shards)] or [0] * (len(BUCKETS) + 2)
+        return counts[:-1], counts[-1]
+
+    def reset(self):
+        with self._lock:
+            for shard in self._shards:
+                shard[:] = [0] * (len(BUCKETS) + 1) + [0.0]
+
+
+class Metrics:
+    """Registry of per-mitigation latency histograms, rejection counters and tracked caches."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._latency = {}  # mitigation -> Histogram
+        self._rejections = {}  # (mitigation, reason) -> count
+        self._caches = {}  # name -> object with hits/misses
+        self._lock = Lock()
+
+    def histogram(self, mitigation: str) -> Histogram:
+        with self._lock:
+            return self._latency.setdefault(mitigation, Histogram())
+
+    def observe(self, mitigation: str, seconds: float):
+        self.histogram(mitigation).observe(seconds)
+
+    def reject(self, mitigation: str, reason: str):
+        with self._lock:
+            key = (mitigation, reason)
+            self._rejections[key] = self._rejections.get(key, 0) + 1
+
+    def track_cache(self, name: str, cache):
+        """Export ``cache.hits``/``cache.misses`` as hit/miss counters and a hit ratio."""
+        self._caches[name] = cache
+
+    def instrument(self, mitigation: str):
+        """Decorator recording latency, calls and rejections of a mitigation function."""
+        def decorate(fn):
+            if os.environ.get("A2A_METRICS", "1") == "0":
+                return fn
+            metrics = self
+            observe = self.histogram(mitigation).observe
+            clock = time.perf_counter
+
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    if not metrics.enabled:
+                        return await fn(*args, **kwargs)
+                    started = clock()
+                    try:
+                        return await fn(*args, **kwargs)
+                    except Exception as e:
+                        metrics.reject(mitigation, _reason(e))
+                        raise
+                    finally:
+                        observe(clock() - started)
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not metrics.enabled:
+                    return fn(*args, **kwargs)
+                started = clock()
+                try:
+                    return fn(*args, **kwargs)
+                except Exception as e:
+                    metrics.reject(mitigation, _reason(e))
+                    raise
+                finally:
+                    observe(clock() - started)
+            return wrapper
+        return decorate
+
+    def export_prometheus(self) -> str:
+        lines = ["# HELP a2a_mitigation_latency_seconds Time spent in each security mitigation.",
+                 "# TYPE a2a_mitigation_latency_seconds histogram"]
+        for mitigation, histogram in sorted(self._latency.items()):
+            counts, total = histogram.snapshot()
+            label = f'mitigation="{_escape(mitigation)}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f'a2a_mitigation_latency_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f"a2a_mitigation_latency_seconds_sum{{{label}}} {total}")
+            lines.append(f"a2a_mitigation_latency_seconds_count{{{label}}} {cumulative}")
+        lines += ["# HELP a2a_mitigation_rejections_total Requests rejected by each mitigation, by reason.",
+                  "# TYPE a2a_mitigation_rejections_total counter"]
+        with self._lock:
+            rejections = sorted(self._rejections.items())
+        for (mitigation, reason), count in rejections:
+            lines.append(f'a2a_mitigation_rejections_total{{mitigation="{_escape(mitigation)}",'
+                         f'reason="{_escape(reason)}"}} {count}')
+        lines += ["# HELP a2a_cache_requests_total Cache lookups by result.",
+                  "# TYPE a2a_cache_requests_total counter"]
+        ratios = []
+        for name, cache in sorted(self._caches.items()):
+            hits, misses = getattr(cache, "hits", 0), getattr(cache, "misses", 0)
+            lines.append(f'a2a_cache_requests_total{{cache="{_escape(name)}",result="hit"}} {hits}')
+            lines.append(f'a2a_cache_requests_total{{cache="{_escape(name)}",result="miss"}} {misses}')
+            ratios.append(f'a2a_cache_hit_ratio{{cache="{_escape(name)}"}} {hits / (hits + misses) if hits + misses else 0.0}')
+        lines += ["# HELP a2a_cache_hit_ratio Fraction of cache lookups served from the cache.",
+                  "# TYPE a2a_cache_hit_ratio gauge"] + ratios
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            for histogram in self._latency.values():
+                histogram.reset()
+            self._rejections.clear()
+
+
+def _reason(exc: Exception) -> str:
+    return str(getattr(exc, "reason", None) or type(exc).__name__)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Shared by all mitigation modules; serve METRICS.export_prometheus() at /metrics.
+METRICS = Metrics()
+instrument = METRICS.instrument
+
+
+def test_metrics():
+    import asyncio
+    from types import SimpleNamespace
+    metrics = Metrics()
+
+    @metrics.instrument("input_validation")
+    def sanitize(text):
+        if "<script>" in text:
+            raise ValueError("Unsafe content")
+        return text
+
+    @metrics.instrument("jwt")
+    async def validate(token):
+        return token
+
+    for text in ("hello", "world", "<script>"):
+        try:
+            sanitize(text)
+        except ValueError:
+            pass
+    asyncio.run(validate("t"))
+    metrics.track_cache("verdicts", SimpleNamespace(hits=3, misses=1))
+    metrics.enabled = False
+    assert sanitize("skipped") == "skipped"
+    text = metrics.export_prometheus()
+    assert 'a2a_mitigation_latency_seconds_count{mitigation="input_validation"} 3' in text
+    assert 'a2a_mitigation_latency_seconds_bucket{mitigation="input_validation",le="+Inf"} 3' in text
+    assert 'a2a_mitigation_latency_seconds_count{mitigation="jwt"} 1' in text
+    assert 'a2a_mitigation_rejections_total{mitigation="input_validation",reason="ValueError"} 1' in text
+    assert 'a2a_cache_hit_ratio{cache="verdicts"} 0.75' in text
+
+
+if __name__ == "__main__":
+    test_metrics()
+    print("Metrics ran successfully.")
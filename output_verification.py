@@ -3,17 +3,44 @@
 Mitigates: Artifact Tampering, Data Leakage
 MAESTRO Layers: 2 (Data Operations), 3 (Agent Frameworks)
 """
-from common.types import Artifact, TextPart
+from common.types import Artifact, TaskArtifactUpdateEvent, TextPart
+from artifact_scanner import StreamingArtifactVerifier, scan_part
+from term_matcher import ForbiddenContentError, ForbiddenTermIndex
+from metrics import instrument
+from verdict_cache import VerdictCache
 
-def filter_artifact_content(artifact: Artifact) -> Artifact:
+# Compiled once; call FORBIDDEN_TERMS.reload(terms) to hot-swap the list.
+FORBIDDEN_TERMS = ForbiddenTermIndex({"hack", "exploit"})
+
+@instrument("output_verification")
+def filter_artifact_content(artifact: Artifact, forbidden: ForbiddenTermIndex = FORBIDDEN_TERMS,
+                            cache: VerdictCache = None) -> Artifact:
     """Prevent artifacts with forbidden words from being shared across agents."""
-    forbidden = {"hack", "exploit"}
     for part in artifact.parts:
-        if isinstance(part, TextPart) and any(word in part.text.lower() for word in forbidden):
-            raise ValueError("Artifact contains forbidden content")
+        if isinstance(part, TextPart):
+            if cache is None:
+                match = forbidden.search(part.text)
+            else:
+                match = cache.check(forbidden, part.text, forbidden.search)
+        else:
+            # File and data parts are decoded/mapped incrementally, never loaded whole.
+            match = scan_part(part, forbidden)
+        if match:
+            raise ForbiddenContentError(match)
     return artifact
 
+async def filter_artifact_stream(events, forbidden: ForbiddenTermIndex = FORBIDDEN_TERMS):
+    """Verify streamed artifact updates as they arrive instead of buffering the whole artifact."""
+    verifier = StreamingArtifactVerifier(forbidden)
+    async for event in events:
+        if isinstance(event, TaskArtifactUpdateEvent):
+            verifier.feed(event)
+        yield event
+    verifier.close()
+
 # Example usage:
 if __name__ == "__main__":
     artifact = Artifact(parts=[TextPart(text="Safe output")])
     filter_artifact_content(artifact)
+    # async for event in filter_artifact_stream(task_events):
+    #     await send(event)
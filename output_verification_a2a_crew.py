@@ -3,58 +3,63 @@ Mitigation Example 2: Output Verification & Content Filtering (A2A + Google GenA
 Filters artifacts to prevent leaking sensitive or forbidden content.
 """
 from samples.python.common.types import Artifact, TextPart
-from crewai import Agent, Crew, LLM, Task
-from crewai.process import Process
-from dotenv import load_dotenv
-import os
-from google import genai
+from crew_support import LazyCrew
 import logging
+from artifact_scanner import StreamingArtifactVerifier, scan_part
+from term_matcher import ForbiddenContentError, ForbiddenTermIndex
+from metrics import instrument
+from verdict_cache import VerdictCache, shared_verdicts
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("output_verification")
 
-def get_api_key():
-    load_dotenv()
-    return os.getenv("GOOGLE_API_KEY")
+FORBIDDEN_TERMS = ForbiddenTermIndex({"hack", "exploit", "secret"})
 
-def filter_artifact_content(artifact: Artifact) -> Artifact:
-    forbidden = {"hack", "exploit", "secret"}
+@instrument("output_verification")
+def filter_artifact_content(artifact: Artifact, forbidden: ForbiddenTermIndex = FORBIDDEN_TERMS,
+                            cache: VerdictCache = None) -> Artifact:
     for part in artifact.parts:
-        if isinstance(part, TextPart) and any(word in part.text.lower() for word in forbidden):
-            raise ValueError("Artifact contains forbidden content")
+        if isinstance(part, TextPart):
+            if cache is None:
+                match = forbidden.search(part.text)
+            else:
+                match = cache.check(forbidden, part.text, forbidden.search)
+        else:
+            # File and data parts are decoded/mapped incrementally, never loaded whole.
+            match = scan_part(part, forbidden)
+        if match:
+            raise ForbiddenContentError(match)
     return artifact
 
-class OutputVerificationAgent:
-    def __init__(self):
-        self.llm = LLM(model="gemini/gemini-2.0-flash", api_key=get_api_key())
-        self.agent = Agent(
-            role="Output Verifier",
-            goal="Ensure all outgoing artifacts are free from sensitive or forbidden content.",
-            backstory="You are a security-focused AI agent that filters artifacts before sharing.",
-            verbose=False,
-            allow_delegation=False,
-            tools=[],
-            llm=self.llm,
-        )
-        self.task = Task(
-            description="Filter the artifact for forbidden content.",
-            expected_output="A safe Artifact object or an error if forbidden content is detected.",
-            agent=self.agent,
-        )
-        self.crew = Crew(
-            agents=[self.agent],
-            tasks=[self.task],
-            process=Process.sequential,
-            verbose=False,
-        )
+class OutputVerificationAgent(LazyCrew):
+    role = "Output Verifier"
+    goal = "Ensure all outgoing artifacts are free from sensitive or forbidden content."
+    backstory = "You are a security-focused AI agent that filters artifacts before sharing."
+    task_description = "Filter the artifact for forbidden content."
+    expected_output = "A safe Artifact object or an error if forbidden content is detected."
+
     def verify(self, artifact: Artifact):
         try:
-            filtered = filter_artifact_content(artifact)
+            filtered = filter_artifact_content(artifact, cache=shared_verdicts)
             logger.info("Artifact filtered: %s", filtered)
             return filtered
-        except ValueError as e:
-            logger.error("Filtering failed: %s", e)
+        except ForbiddenContentError as e:
+            logger.error("Filtering failed: %s (term %r at %d)", e, e.match.term, e.match.start)
             return str(e)
+    def verify_stream(self, chunks):
+        """Yield artifact chunks as they pass verification; raise ``ForbiddenContentError`` at the first forbidden term.
+
+        Chunks already yielded stay sent, so the caller must treat the exception as
+        a rejection of the whole stream and tell the receiver.
+        """
+        verifier = StreamingArtifactVerifier(FORBIDDEN_TERMS)
+        try:
+            for chunk in chunks:
+                yield verifier.feed(chunk)
+            verifier.close()
+        except ForbiddenContentError as e:
+            logger.error("Stream rejected: %s (term %r at %d)", e, e.match.term, e.match.start)
+            raise
 
 def test_output_verification_agent():
     from samples.python.common.types import TextPart
@@ -64,6 +69,19 @@ def test_output_verification_agent():
     forbidden = Artifact(parts=[TextPart(text="This is a hack")])
     result = agent.verify(forbidden)
     assert "forbidden content" in result
+    chunks = [
+        Artifact(parts=[TextPart(text="Keep this ")]),
+        Artifact(parts=[TextPart(text="sec")], append=True),
+        Artifact(parts=[TextPart(text="ret safe")], append=True, lastChunk=True),
+    ]
+    passed = []
+    try:
+        for chunk in agent.verify_stream(chunks):
+            passed.append(chunk)
+        assert False, "forbidden stream was not rejected"
+    except ForbiddenContentError as e:
+        assert e.match.term == "secret"
+    assert len(passed) == 2
 
 if __name__ == "__main__":
     test_output_verification_agent()
@@ -0,0 +1,228 @@
+"""
+Rate limiter engines shared by the rate limiting examples.
+Mitigates: DoS, Task Replay
+MAESTRO Layers: 4 (Deployment & Infrastructure), 3 (Agent Frameworks)
+
+Every engine exposes ``allow(key) -> bool`` and keeps a fixed amount of state
+per key, so a check costs the same no matter how high the limit is. Keys that
+have been idle long enough to be indistinguishable from a new caller are
+evicted, which keeps the per-key table from growing forever.
+"""
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class TokenBucketLimiter:
+    """Token bucket: ``limit`` tokens of burst, refilled evenly over ``interval`` seconds."""
+
+    def __init__(self, limit: int, interval: float, clock=time.monotonic):
+        if limit <= 0 or interval <= 0:
+            raise ValueError("limit and interval must be positive")
+        self.limit = limit
+        self.interval = interval
+        self._rate = limit / interval
+        self._clock = clock
+        self._lock = Lock()
+        # key -> (tokens, last_refill); ordered from least to most recently used.
+        self._state = OrderedDict()
+
+    def allow(self, key) -> bool:
+        now = self._clock()
+        with self._lock:
+            self._evict_idle(now)
+            tokens, last = self._state.pop(key, (self.limit, now))
+            tokens = min(self.limit, tokens + (now - last) * self._rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._state[key] = (tokens, now)
+            return allowed
+
+    def _evict_idle(self, now):
+        # A bucket untouched for a whole interval is full again, so forgetting it
+        # is lossless. Entries are in LRU order: stop at the first recent one.
+        state = self._state
+        while state:
+            key, (_, last) = next(iter(state.items()))
+            if now - last < self.interval:
+                break
+            del state[key]
+
+    def __len__(self):
+        return len(self._state)
+
+
+class GCRALimiter:
+    """Generic Cell Rate Algorithm: one "theoretical arrival time" float per key."""
+
+    def __init__(self, limit: int, interval: float, clock=time.monotonic):
+        if limit <= 0 or interval <= 0:
+            raise ValueError("limit and interval must be positive")
+        self.limit = limit
+        self.interval = interval
+        self._emission = interval / limit
+        self._tolerance = self._emission * (limit - 1)
+        self._clock = clock
+        self._lock = Lock()
+        self._state = OrderedDict()  # key -> theoretical arrival time
+
+    def allow(self, key) -> bool:
+        now = self._clock()
+        with self._lock:
+            self._evict_idle(now)
+            tat = max(self._state.pop(key, now), now)
+            allowed = tat - self._tolerance <= now
+            self._state[key] = tat + self._emission if allowed else tat
+            return allowed
+
+    def _evict_idle(self, now):
+        # Once the arrival time is in the past the key has its full burst back.
+        state = self._state
+        while state:
+            key, tat = next(iter(state.items()))
+            if tat > now:
+                break
+            del state[key]
+
+    def __len__(self):
+        return len(self._state)
+
+
+class SharedMemoryLimiter:
+    """GCRA limiter whose state lives in an mmap'd file shared by every worker process.
+
+    The file holds a fixed table of 16-byte slots (8-byte key hash, 8-byte
+    arrival time), grouped into stripes. A key only ever lives in its own
+    stripe, and each update holds an ``fcntl`` byte-range lock on that stripe,
+    so read-modify-write is atomic across processes without a network hop.
+    All workers must be configured with the same limit and interval.
+    """
+
+    _MAGIC = b"A2ARL001"
+    _HEADER = struct.Struct("<8sI4x")
+    _SLOT = struct.Struct("<Qd")
+    STRIPE_SLOTS = 8
+
+    def __init__(self, limit: int, interval: float, path: str = "/dev/shm/a2a-rate-limit",
+                 stripes: int = 8192, clock=time.time):
+        if limit <= 0 or interval <= 0:
+            raise ValueError("limit and interval must be positive")
+        self.limit = limit
+        self.interval = interval
+        self.path = path
+        self._emission = interval / limit
+        self._tolerance = self._emission * (limit - 1)
+        self._clock = clock
+        # fcntl locks are per process, so threads of one worker also need a lock.
+        self._lock = Lock()
+        self._stripe_bytes = self.STRIPE_SLOTS * self._SLOT.size
+        size = self._HEADER.size + stripes * self._stripe_bytes
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, self._HEADER.size, 0)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, self._HEADER.pack(self._MAGIC, stripes), 0)
+            magic, self._stripes = self._HEADER.unpack(os.pread(self._fd, self._HEADER.size, 0))
+            if magic != self._MAGIC:
+                raise ValueError(f"{path} is not a rate limiter segment")
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, self._HEADER.size, 0)
+        self._map = mmap.mmap(self._fd, self._HEADER.size + self._stripes * self._stripe_bytes)
+
+    def allow(self, key) -> bool:
+        digest = hashlib.blake2b(str(key).encode(), digest_size=8).digest()
+        key_hash = int.from_bytes(digest, "little") or 1
+        base = self._HEADER.size + (key_hash % self._stripes) * self._stripe_bytes
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, self._stripe_bytes, base)
+            try:
+                return self._update(base, key_hash, self._clock())
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, self._stripe_bytes, base)
+
+    def _update(self, base, key_hash, now):
+        slot = self._SLOT
+        target = victim = None
+        victim_tat = float("inf")
+        for offset in range(base, base + self._stripe_bytes, slot.size):
+            slot_hash, tat = slot.unpack_from(self._map, offset)
+            if slot_hash == key_hash:
+                target = offset
+                break
+            # Empty slots and keys whose arrival time has passed are free to reuse;
+            # if the stripe is full, the key closest to being idle is evicted.
+            if slot_hash == 0 or tat <= now:
+                tat = float("-inf")
+            if tat < victim_tat:
+                victim, victim_tat = offset, tat
+        if target is None:
+            target, tat = victim, now
+        tat = max(tat, now)
+        allowed = tat - self._tolerance <= now
+        slot.pack_into(self._map, target, key_hash, tat + self._emission if allowed else tat)
+        return allowed
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+
+LIMITERS = {"token_bucket": TokenBucketLimiter, "gcra": GCRALimiter, "shared": SharedMemoryLimiter}
+
+
+def make_limiter(limit: int, interval: float, mode: str = "token_bucket", **options):
+    """Build a limiter engine by name ("token_bucket", "gcra" or "shared")."""
+    try:
+        factory = LIMITERS[mode]
+    except KeyError:
+        raise ValueError(f"Unknown rate limiter mode: {mode}")
+    return factory(limit, interval, **options)
+
+
+def test_limiter_engines():
+    for mode in ("token_bucket", "gcra"):
+        now = [0.0]
+        limiter = LIMITERS[mode](3, 2.0, clock=lambda: now[0])
+        assert limiter.allow("user1")
+        assert limiter.allow("user1")
+        assert limiter.allow("user1")
+        assert not limiter.allow("user1")
+        assert limiter.allow("user2")
+        now[0] += 2.0
+        assert limiter.allow("user1")
+        # Idle keys are evicted instead of accumulating.
+        now[0] += 10.0
+        limiter.allow("user3")
+        assert len(limiter) == 1
+
+
+def _hammer_shared_limiter(path, attempts):
+    limiter = SharedMemoryLimiter(10, 60.0, path=path, stripes=64)
+    try:
+        return sum(limiter.allow("user1") for _ in range(attempts))
+    finally:
+        limiter.close()
+
+
+def test_shared_memory_limiter_multiprocess():
+    import multiprocessing
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rate-limit")
+        with multiprocessing.get_context("spawn").Pool(4) as pool:
+            allowed = pool.starmap(_hammer_shared_limiter, [(path, 25)] * 4)
+        # Four workers, one shared budget: exactly the limit gets through.
+        assert sum(allowed) == 10
+
+
+if __name__ == "__main__":
+    test_limiter_engines()
+    test_shared_memory_limiter_multiprocess()
+    print("Rate limiter engines ran successfully.")
@@ -4,29 +4,117 @@ Mitigates: DoS, Task Replay, Insider Threats
 MAESTRO Layers: 4 (Deployment & Infrastructure), 3 (Agent Frameworks), 6 (Security & Compliance)
 """
 from common.server.task_manager import InMemoryTaskManager
-import time
+from admission import AdmissionScheduler
+from rate_limiter import make_limiter
 
 class SecureTaskManager(InMemoryTaskManager):
-    def __init__(self):
+    def __init__(self, mode: str = "token_bucket", **limiter_options):
         super().__init__()
-        self._rate_limit = {}
         self._limit = 5
         self._interval = 1.0  # seconds
-
-    def _check_rate_limit(self, user_id: str):
-        now = time.time()
-        times = self._rate_limit.get(user_id, [])
-        times = [t for t in times if now - t < self._interval]
-        if len(times) >= self._limit:
-            raise Exception("Rate limit exceeded")
-        times.append(now)
-        self._rate_limit[user_id] = times
+        # O(1) per-user state; idle users are evicted by the engine.
+        # Use mode="shared" so every worker process on the host enforces one limit.
+        self._rate_limit = make_limiter(self._limit, self._interval, mode, **limiter_options)
+        # Over-limit requests wait in per-user fair queues instead of failing
+        # outright; they are shed with AdmissionRejected once their deadline passes.
+        self._admission = AdmissionScheduler(self._rate_limit, max_in_flight=4, max_queue_depth=32, timeout=5.0)
 
     async def on_send_task(self, request):
         user_id = getattr(request, 'user_id', 'default')
-        self._check_rate_limit(user_id)
-        return await super().on_send_task(request)
+        async with self._admission.admit(user_id, getattr(request, 'tenant_id', user_id)):
+            return await super().on_send_task(request)
+
+    async def on_send_task_subscribe(self, request):
+        user_id = getattr(request, 'user_id', 'default')
+        tenant = await self._admission.acquire(user_id, getattr(request, 'tenant_id', user_id))
+        try:
+            response = await super().on_send_task_subscribe(request)
+        except BaseException:
+            self._admission.release(tenant)
+            raise
+        if not hasattr(response, '__aiter__'):
+            self._admission.release(tenant)
+            return response
+        return _AdmittedStream(response, lambda: self._admission.release(tenant))
+
+
+class _AdmittedStream:
+    """A subscription's events; holds its in-flight slot until exhausted, closed or dropped.
+
+    A generator's ``finally`` would not run for a stream dropped before its
+    first ``__anext__``, which would leak the slot and lock the user out.
+    """
+
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self._stream.__anext__()
+        except BaseException:  # StopAsyncIteration included: the stream is over
+            self._done()
+            raise
+
+    async def aclose(self):
+        self._done()
+        aclose = getattr(self._stream, 'aclose', None)
+        if aclose is not None:
+            await aclose()
+
+    def _done(self):
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def __del__(self):
+        self._done()
+
+
+def test_abandoned_subscription():
+    import asyncio
+    import functools
+    import gc
+    import itertools
+    from types import SimpleNamespace
+
+    class StreamingAgent(InMemoryTaskManager):
+        async def on_send_task(self, request):
+            return request
+
+        async def on_send_task_subscribe(self, request):
+            async def events():
+                yield request
+            return events()
+
+    class Manager(SecureTaskManager, StreamingAgent):
+        pass
+
+    async def scenario():
+        # Each clock reading is a second later, so only the in-flight cap can hold requests back.
+        manager = Manager(clock=functools.partial(next, itertools.count()))
+        manager._admission.timeout = 0.1
+        request = SimpleNamespace(user_id='u')
+        for _ in range(manager._admission.max_in_flight):
+            await manager.on_send_task_subscribe(request)  # dropped before the first event
+        gc.collect()
+        assert not manager._admission._in_flight
+        assert await manager.on_send_task(request) is request
+        stream = await manager.on_send_task_subscribe(request)
+        assert [event async for event in stream] == [request]
+        stream = await manager.on_send_task_subscribe(request)
+        await stream.aclose()
+        assert not manager._admission._in_flight
+
+    asyncio.run(scenario())
 
 # Example usage:
 # manager = SecureTaskManager()
+# manager = SecureTaskManager(mode="shared", path="/dev/shm/a2a-rate-limit")  # multi-worker
 # await manager.on_send_task(request)
+if __name__ == "__main__":
+    test_abandoned_subscription()
+    print("Rate limiting ran successfully.")
@@ -3,59 +3,30 @@ Mitigation Example 4: Rate Limiting & Monitoring (A2A + Google GenAI + CrewAI)
 Enforces rate limits to protect against DoS and abuse.
 """
 import time
-from collections import defaultdict
-from crewai import Agent, Crew, LLM, Task
-from crewai.process import Process
-from dotenv import load_dotenv
-import os
-from google import genai
+from crew_support import LazyCrew
 import logging
+from rate_limiter import make_limiter
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("rate_limit")
 
-def get_api_key():
-    load_dotenv()
-    return os.getenv("GOOGLE_API_KEY")
-
 class RateLimiter:
-    def __init__(self, max_calls, period_seconds):
+    def __init__(self, max_calls, period_seconds, mode="token_bucket", **options):
         self.max_calls = max_calls
         self.period = period_seconds
-        self.calls = defaultdict(list)
+        self.calls = make_limiter(max_calls, period_seconds, mode, **options)
 
     def is_allowed(self, user_id):
-        now = time.time()
-        calls = self.calls[user_id]
-        self.calls[user_id] = [t for t in calls if now - t < self.period]
-        if len(self.calls[user_id]) < self.max_calls:
-            self.calls[user_id].append(now)
-            return True
-        return False
+        return self.calls.allow(user_id)
+
+class RateLimitAgent(LazyCrew):
+    role = "Rate Limiter"
+    goal = "Enforce rate limits and monitor API usage."
+    backstory = "You are a security agent that prevents DoS and abuse by enforcing rate limits."
+    task_description = "Enforce rate limits for user actions."
+    expected_output = "True if allowed, False if blocked."
 
-class RateLimitAgent:
     def __init__(self):
-        self.llm = LLM(model="gemini/gemini-2.0-flash", api_key=get_api_key())
-        self.agent = Agent(
-            role="Rate Limiter",
-            goal="Enforce rate limits and monitor API usage.",
-            backstory="You are a security agent that prevents DoS and abuse by enforcing rate limits.",
-            verbose=False,
-            allow_delegation=False,
-            tools=[],
-            llm=self.llm,
-        )
-        self.task = Task(
-            description="Enforce rate limits for user actions.",
-            expected_output="True if allowed, False if blocked.",
-            agent=self.agent,
-        )
-        self.crew = Crew(
-            agents=[self.agent],
-            tasks=[self.task],
-            process=Process.sequential,
-            verbose=False,
-        )
         self.limiter = RateLimiter(3, 2)
     def check(self, user_id):
         allowed = self.limiter.is_allowed(user_id)
@@ -3,13 +3,39 @@
 Mitigates: Message Schema Violation, Task Replay
 MAESTRO Layers: 2 (Data Operations), 3 (Agent Frameworks)
 """
-from common.types import Message, TextPart
-from pydantic import ValidationError
+from typing import List, Union
+from common.types import Artifact, Message, TaskStatus, TextPart
+from pydantic import TypeAdapter, ValidationError
+from metrics import instrument
 
-def validate_message_schema(message: Message):
-    """Validate that a Message conforms to the A2A schema using pydantic."""
+# Validators are built once at import and reused for every request.
+MESSAGE = TypeAdapter(Message)
+ARTIFACT = TypeAdapter(Artifact)
+TASK_STATUS = TypeAdapter(TaskStatus)
+HISTORY = TypeAdapter(List[Message])
+
+def validate_json(raw: Union[bytes, str], adapter: TypeAdapter = MESSAGE):
+    """Parse and validate a raw request body in one step, without building an intermediate dict."""
+    try:
+        return adapter.validate_json(raw)
+    except ValidationError as e:
+        raise ValueError(f"Schema validation failed: {e}")
+
+@instrument("schema_validation")
+def validate_message_schema(message: Message, deep: bool = True):
+    """Validate that a Message conforms to the A2A schema using pydantic.
+
+    Raw request bodies should go through ``validate_json`` (or
+    ``MESSAGE.validate_json``), which parses and validates in one step.
+
+    By default everything is dumped and revalidated, which also catches fields
+    mutated after validation or set through ``model_construct``. ``deep=False``
+    is an opt-in fast path for call sites that built the model themselves and
+    trust its construction: the top-level fields are checked directly from the
+    instance, and nested parts only have to be instances of their part types.
+    """
     try:
-        message.model_validate(message.model_dump())
+        MESSAGE.validate_python(message.model_dump(warnings=False) if deep else message.__dict__)
     except ValidationError as e:
         raise ValueError(f"Schema validation failed: {e}")
 
@@ -17,3 +43,12 @@ def validate_message_schema(message: Message):
 if __name__ == "__main__":
     msg = Message(role="user", parts=[TextPart(text="Test")])
     validate_message_schema(msg)
+    validate_message_schema(msg, deep=False)
+    mutated = Message(role="user", parts=[TextPart(text="Test")])
+    mutated.parts[0].text = 123
+    try:
+        validate_message_schema(mutated)
+        assert False, "mutated part passed"
+    except ValueError:
+        pass
+    assert validate_json(b'{"role": "user", "parts": [{"type": "text", "text": "Test"}]}') == msg
@@ -3,10 +3,33 @@
 Mitigates: Artifact Tampering, Insider Threats
 MAESTRO Layers: 3 (Agent Frameworks), 6 (Security & Compliance)
 """
-from common.utils.in_memory_cache import InMemoryCache
+import functools
 
-cache = InMemoryCache()
+from bounded_cache import BoundedCache
+from single_flight import SingleFlight
+from spill_cache import SpillCache
+
+# InMemoryCache keeps every artifact forever; BoundedCache has the same
+# set/get/delete interface but expires entries and evicts LRU over the limits.
+cache = BoundedCache(max_entries=10_000, max_bytes=64 * 1024 * 1024, default_ttl=3600)
 cache.set("artifact:123", {"result": "data"})
 assert cache.get("artifact:123") == {"result": "data"}
 cache.delete("artifact:123")
 assert cache.get("artifact:123") is None
+
+# Concurrent misses for the same artifact share one (possibly LLM-backed) computation;
+# entries within a minute of expiry are recomputed in the background.
+artifacts = SingleFlight(cache, refresh_ahead=60)
+assert artifacts.get_or_compute("artifact:456", lambda: {"result": "computed"}, ttl=300) == {"result": "computed"}
+
+# Large artifacts live in HMAC-checked mmap segments instead of on the heap. The
+# cache and its temporary directory are only created on first use.
+@functools.lru_cache(maxsize=None)
+def large_artifacts() -> SpillCache:
+    return SpillCache(threshold=64 * 1024, default_ttl=3600)
+
+if __name__ == "__main__":
+    large_artifacts().set("artifact:789", b"\0" * 100_000)
+    assert large_artifacts().get("artifact:789") == b"\0" * 100_000  # zero-copy memoryview
+    large_artifacts().close()  # removes its temporary directory
+    print(cache.stats())
@@ -2,46 +2,23 @@
 Mitigation Example 6: Secure State & Cache Management (A2A + Google GenAI + CrewAI)
 Demonstrates secure, thread-safe cache usage for artifacts and credentials.
 """
-from common.utils.in_memory_cache import InMemoryCache
+from bounded_cache import BoundedCache
 import threading
-from crewai import Agent, Crew, LLM, Task
-from crewai.process import Process
-from dotenv import load_dotenv
-import os
-from google import genai
+from crew_support import LazyCrew
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("secure_cache")
 
-def get_api_key():
-    load_dotenv()
-    return os.getenv("GOOGLE_API_KEY")
+class SecureCacheAgent(LazyCrew):
+    role = "Cache Manager"
+    goal = "Ensure secure, thread-safe cache management for artifacts and credentials."
+    backstory = "You are a security agent that manages cache with thread safety."
+    task_description = "Securely store and retrieve items in the cache."
+    expected_output = "Cache operations succeed without race conditions."
 
-class SecureCacheAgent:
     def __init__(self):
-        self.llm = LLM(model="gemini/gemini-2.0-flash", api_key=get_api_key())
-        self.agent = Agent(
-            role="Cache Manager",
-            goal="Ensure secure, thread-safe cache management for artifacts and credentials.",
-            backstory="You are a security agent that manages cache with thread safety.",
-            verbose=False,
-            allow_delegation=False,
-            tools=[],
-            llm=self.llm,
-        )
-        self.task = Task(
-            description="Securely store and retrieve items in the cache.",
-            expected_output="Cache operations succeed without race conditions.",
-            agent=self.agent,
-        )
-        self.crew = Crew(
-            agents=[self.agent],
-            tasks=[self.task],
-            process=Process.sequential,
-            verbose=False,
-        )
-        self.cache = InMemoryCache()
+        self.cache = BoundedCache(max_entries=10_000, max_bytes=64 * 1024 * 1024, default_ttl=3600)
     def cache_example(self):
         self.cache.set("artifact", "value")
         assert self.cache.get("artifact") == "value"
@@ -56,7 +33,7 @@ class SecureCacheAgent:
         for t in threads:
             t.join()
         assert self.cache.get("key") == "v"
-        logger.info("Cache is thread-safe and secure.")
+        logger.info("Cache is thread-safe and secure: %s", self.cache.stats())
         return True
 
 def test_secure_cache_agent():
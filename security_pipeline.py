@@ -0,0 +1,402 @@
+"""
+Fused, single-pass security checks for A2A messages, artifacts and task status.
+Mitigates: Prompt Injection, Message Schema Violation, Data Leakage, Log Injection
+MAESTRO Layers: 2 (Data Operations), 3 (Agent Frameworks), 6 (Security & Compliance)
+
+Calling ``sanitize_message_parts``, ``validate_message_schema``,
+``filter_artifact_content`` and ``log_task_status`` one after another walks
+the parts once per mitigation, and each reports a failure its own way.
+``SecurityPipeline`` runs every enabled check on a part before moving on to
+the next part, stops at the first rejection, and returns one ``Verdict``
+naming the check, the reason and the offending part. A check is any callable
+``check(part, text)`` with a ``name`` that returns ``None`` or
+``(reason, detail)``; ``text`` is the part's text, or ``None`` for file and
+data parts. Parts are checked in order, so a rejection in an early part costs
+no more than scanning up to it.
+
+The schema check is the in-process fast path of ``schema_validation``: the
+item's fields are validated with the same ``MESSAGE``/``ARTIFACT`` adapters
+that ``validate_message_schema(..., deep=False)`` uses. Validate raw request
+bodies with ``validate_json`` at the edge. ``PipelineTaskManager`` applies
+the pipeline to incoming messages and outgoing artifacts and status updates,
+and combines with the rate limiter:
+``class Manager(SecureTaskManager, PipelineTaskManager)``.
+"""
+import logging
+from typing import Any, NamedTuple, Optional
+
+from common.server.task_manager import InMemoryTaskManager
+from common.types import TextPart
+from pydantic import ValidationError
+from artifact_scanner import StreamingArtifactVerifier, scan_part
+from input_validation import UNSAFE_PATTERNS
+from metrics import instrument
+from output_verification import FORBIDDEN_TERMS
+from schema_validation import ARTIFACT, MESSAGE
+from term_matcher import ForbiddenContentError, TermMatch
+
+logger = logging.getLogger("a2a_observability")
+
+
+class Verdict(NamedTuple):
+    allowed: bool
+    check: Optional[str] = None  # name of the rejecting check
+    reason: Optional[str] = None
+    part_index: Optional[int] = None  # None when the message itself is at fault
+    detail: Any = None  # e.g. the TermMatch of a forbidden term
+
+
+ALLOWED = Verdict(True)
+
+
+class SecurityRejected(ValueError):
+    """Raised by ``PipelineTaskManager`` with the rejecting ``Verdict``."""
+
+    def __init__(self, verdict: Verdict):
+        super().__init__(verdict.reason)
+        self.verdict = verdict
+        self.reason = verdict.check  # metrics label rejections by check
+
+
+class UnsafeInputCheck:
+    name = "input_validation"
+    reason = "Input contains potentially unsafe characters"
+
+    def __init__(self, unsafe=UNSAFE_PATTERNS):
+        self.unsafe = unsafe
+
+    def __call__(self, part, text):
+        if text is not None and self.unsafe.is_unsafe(text):
+            return self.reason, None
+        return None
+
+
+class ForbiddenTermsCheck:
+    name = "output_verification"
+    reason = "Artifact contains forbidden content"
+    per_chunk = False  # a term can straddle streamed chunks; see StreamGuard
+
+    def __init__(self, forbidden=FORBIDDEN_TERMS):
+        self.forbidden = forbidden
+
+    def __call__(self, part, text):
+        match = self.forbidden.search(text) if text is not None else scan_part(part, self.forbidden)
+        if match:
+            return self.reason, match
+        return None
+
+
+class LogInjectionCheck:
+    name = "audit_logging"
+    reason = "Log injection detected"
+
+    def __call__(self, part, text):
+        if text is not None and ("\n" in text or "\r" in text):
+            return self.reason, None
+        return None
+
+
+class SecurityPipeline:
+    """Runs the enabled checks over each part in one traversal and returns a ``Verdict``.
+
+    ``unsafe``/``forbidden`` set to ``None`` disable those checks;
+    ``message_checks``, ``artifact_checks`` and ``status_checks`` append
+    custom checks to the built-in ones.
+    """
+
+    def __init__(self, unsafe=UNSAFE_PATTERNS, forbidden=FORBIDDEN_TERMS, schema: bool = True,
+                 message_checks=(), artifact_checks=(), status_checks=()):
+        self.schema = schema
+        self.forbidden = forbidden
+        self.message_checks = ((UnsafeInputCheck(unsafe),) if unsafe is not None else ()) + tuple(message_checks)
+        self.artifact_checks = ((ForbiddenTermsCheck(forbidden),) if forbidden is not None else ()) \
+            + tuple(artifact_checks)
+        self.status_checks = (LogInjectionCheck(),) + tuple(status_checks)
+        self._chunk_checks = tuple(c for c in self.artifact_checks if getattr(c, "per_chunk", True))
+
+    def _run(self, checks, parts) -> Verdict:
+        """One pass over ``parts``, running every check on a part before moving to the next."""
+        for index, part in enumerate(parts):
+            if type(part) is TextPart:
+                text = part.text
+                if type(text) is not str:  # built with model_construct, never validated
+                    return Verdict(False, "schema", "Text part has no text", index)
+            else:
+                text = getattr(part, "text", None)
+                if not isinstance(text, str):
+                    text = None
+            for check in checks:
+                failure = check(part, text)
+                if failure is not None:
+                    return Verdict(False, check.name, failure[0], index, failure[1])
+        return ALLOWED
+
+    @staticmethod
+    def _check_schema(adapter, item, kind: str) -> Verdict:
+        try:
+            adapter.validate_python(item.__dict__)
+        except ValidationError as e:
+            loc = e.errors()[0]["loc"]
+            index = loc[1] if len(loc) > 1 and loc[0] == "parts" and isinstance(loc[1], int) else None
+            return Verdict(False, "schema", f"{kind} does not match the A2A schema", index, str(e))
+        return ALLOWED
+
+    def _check(self, checks, adapter, item, kind: str) -> Verdict:
+        # Content checks run first, as they reject most bad input for less;
+        # the parts only need to be a list for them to walk.
+        if self.schema and type(getattr(item, "parts", None)) is not list:
+            return self._check_schema(adapter, item, kind)
+        verdict = self._run(checks, item.parts)
+        if verdict.allowed and self.schema:
+            return self._check_schema(adapter, item, kind)
+        return verdict
+
+    def check_message(self, message) -> Verdict:
+        return self._check(self.message_checks, MESSAGE, message, "Message")
+
+    def check_artifact(self, artifact) -> Verdict:
+        return self._check(self.artifact_checks, ARTIFACT, artifact, "Artifact")
+
+    def check_status(self, status) -> Verdict:
+        """Check a status update's message before it is logged (the first part is what gets logged)."""
+        message = getattr(status, "message", None)
+        if message is None:
+            return ALLOWED
+        return self._run(self.status_checks, message.parts[:1])
+
+    def audit_status(self, status, task_id: str = None, user: str = None) -> Verdict:
+        """``check_status``, then log the update as ``log_task_status`` does if it passed."""
+        verdict = self.check_status(status)
+        if verdict.allowed:
+            message = status.message
+            text = message.parts[0].text if message and message.parts and type(message.parts[0]) is TextPart else ""
+            logger.info("Task %s: %s", status.state, text, extra={"task_id": task_id, "user": user})
+        return verdict
+
+    def stream_guard(self) -> "StreamGuard":
+        return StreamGuard(self)
+
+
+class StreamGuard:
+    """Checks one task's streamed artifact chunks.
+
+    Each chunk gets the pipeline's single pass, minus the forbidden-term scan,
+    which runs over the whole stream instead so that a term split across two
+    chunks is still caught.
+    """
+
+    def __init__(self, pipeline: SecurityPipeline):
+        self.pipeline = pipeline
+        self._verifier = StreamingArtifactVerifier(pipeline.forbidden) if pipeline.forbidden is not None else None
+
+    def check(self, update) -> Verdict:
+        artifact = getattr(update, "artifact", update)
+        verdict = self.pipeline._run(self.pipeline._chunk_checks, artifact.parts)
+        if verdict.allowed and self._verifier is not None:
+            try:
+                self._verifier.feed(artifact)
+            except ForbiddenContentError as e:
+                return Verdict(False, ForbiddenTermsCheck.name, str(e), None, e.match)
+        return verdict
+
+    def close(self) -> Verdict:
+        if self._verifier is not None:
+            try:
+                self._verifier.close()
+            except ForbiddenContentError as e:
+                return Verdict(False, ForbiddenTermsCheck.name, str(e), None, e.match)
+        return ALLOWED
+
+
+# Shared by every PipelineTaskManager unless one is passed in.
+DEFAULT_PIPELINE = SecurityPipeline()
+
+
+class PipelineTaskManager(InMemoryTaskManager):
+    """Task manager that runs the ``SecurityPipeline`` on requests, results and streamed events.
+
+    Rejections raise ``SecurityRejected``; status updates that pass are written to the audit log.
+    A task whose result or stream is rejected is dropped from ``self.tasks``, so the
+    rejected content cannot be read back through ``tasks/get`` or a resubscribe.
+    """
+
+    def __init__(self, pipeline: SecurityPipeline = None):
+        super().__init__()
+        self.pipeline = pipeline or DEFAULT_PIPELINE
+
+    @instrument("security_pipeline")
+    def _enforce(self, check, item):
+        verdict = check(item)
+        if not verdict.allowed:
+            raise SecurityRejected(verdict)
+        return verdict
+
+    def _check_request(self, request):
+        params = getattr(request, "params", request)
+        message = getattr(params, "message", None)
+        if message is not None:
+            self._enforce(self.pipeline.check_message, message)
+        return getattr(params, "id", None), getattr(request, "user_id", None)
+
+    def _check_task(self, task, task_id, user):
+        for artifact in getattr(task, "artifacts", None) or ():
+            self._enforce(self.pipeline.check_artifact, artifact)
+        status = getattr(task, "status", None)
+        if status is not None:
+            self._enforce(lambda s: self.pipeline.audit_status(s, task_id, user), status)
+
+    async def _discard_task(self, task_id):
+        # The wrapped manager stores the task before its result reaches us.
+        async with self.lock:
+            self.tasks.pop(task_id, None)
+
+    async def on_send_task(self, request):
+        task_id, user = self._check_request(request)
+        response = await super().on_send_task(request)
+        result = getattr(response, "result", None)
+        if result is not None:
+            try:
+                self._check_task(result, task_id, user)
+            except SecurityRejected:
+                await self._discard_task(task_id)
+                raise
+        return response
+
+    async def on_send_task_subscribe(self, request):
+        task_id, user = self._check_request(request)
+        response = await super().on_send_task_subscribe(request)
+        if not hasattr(response, "__aiter__"):
+            return response
+        return self._guard_stream(response, task_id, user)
+
+    async def _guard_stream(self, stream, task_id, user):
+        guard = self.pipeline.stream_guard()
+        try:
+            async for event in stream:
+                result = getattr(event, "result", event)
+                if getattr(result, "artifact", None) is not None:
+                    self._enforce(guard.check, result)
+                elif getattr(result, "status", None) is not None:
+                    self._enforce(lambda s: self.pipeline.audit_status(s, task_id, user), result.status)
+                yield event
+            self._enforce(lambda _: guard.close(), None)
+        except SecurityRejected:
+            await self._discard_task(task_id)
+            raise
+
+
+def test_security_pipeline():
+    from common.types import Artifact, FileContent, FilePart, Message, TaskState, TaskStatus
+    import base64
+    pipeline = SecurityPipeline()
+
+    ok = Message(role="user", parts=[TextPart(text="Hello"), TextPart(text="world")])
+    assert pipeline.check_message(ok) == ALLOWED
+    bad = Message(role="user", parts=[TextPart(text="fi\0ne"), TextPart(text="x"), TextPart(text="<script>")])
+    verdict = pipeline.check_message(bad)
+    assert (verdict.allowed, verdict.check, verdict.part_index) == (False, "input_validation", 2)
+    forged = Message.model_construct(role="system", parts=[])
+    assert pipeline.check_message(forged).check == "schema"
+    forged = Message.model_construct(role="user", parts=[TextPart(text="ok"), {"type": "script"}])
+    verdict = pipeline.check_message(forged)
+    assert (verdict.check, verdict.part_index) == ("schema", 1)
+
+    verdict = pipeline.check_artifact(Artifact(parts=[TextPart(text="fine"), TextPart(text="no hacking")]))
+    assert verdict.part_index == 1 and verdict.detail == TermMatch("hack", 3, 7)
+    leaked = Artifact(parts=[TextPart(text="ok"),
+                             FilePart(file=FileContent(bytes=base64.b64encode(b"an exploit").decode()))])
+    verdict = pipeline.check_artifact(leaked)
+    assert verdict.check == "output_verification" and verdict.part_index == 1 and verdict.detail.term == "exploit"
+
+    injected = TaskStatus(state=TaskState.WORKING, message=Message(role="agent", parts=[TextPart(text="a\nb")]))
+    assert pipeline.audit_status(injected).check == "audit_logging"
+
+    # Custom checks compose with the built-in ones.
+    def no_empty(part, text):
+        return ("Empty text part", None) if text == "" else None
+    no_empty.name = "no_empty"
+    strict = SecurityPipeline(message_checks=[no_empty])
+    assert strict.check_message(Message(role="user", parts=[TextPart(text="")])).check == "no_empty"
+
+    # A forbidden term split across streamed chunks is still caught.
+    guard = pipeline.stream_guard()
+    assert guard.check(Artifact(parts=[TextPart(text="an exp")])).allowed
+    verdict = guard.check(Artifact(parts=[TextPart(text="loit")], append=True, lastChunk=True))
+    assert verdict.check == "output_verification"
+
+
+def test_pipeline_task_manager():
+    import asyncio
+    from common.types import (Artifact, Message, SendTaskRequest, SendTaskResponse, SendTaskStreamingRequest,
+                              SendTaskStreamingResponse, Task, TaskArtifactUpdateEvent, TaskSendParams, TaskState,
+                              TaskStatus, TaskStatusUpdateEvent)
+
+    class ReplyingAgent(InMemoryTaskManager):
+        """Stores the task, then replies with ``reply`` as an artifact, like a real agent's manager."""
+        reply = "all good"
+
+        async def on_send_task(self, request):
+            status = TaskStatus(state=TaskState.COMPLETED,
+                                message=Message(role="agent", parts=[TextPart(text="done")]))
+            task = Task(id=request.params.id, status=status, artifacts=[Artifact(parts=[TextPart(text=self.reply)])])
+            async with self.lock:
+                self.tasks[task.id] = task
+            return SendTaskResponse(id=request.id, result=task)
+
+        async def on_send_task_subscribe(self, request):
+            response = await self.on_send_task(request)
+
+            async def events():
+                for index, chunk in enumerate((self.reply[:4], self.reply[4:])):
+                    artifact = Artifact(parts=[TextPart(text=chunk)], append=index > 0)
+                    yield SendTaskStreamingResponse(
+                        id=request.id, result=TaskArtifactUpdateEvent(id=request.params.id, artifact=artifact))
+                yield SendTaskStreamingResponse(id=request.id, result=TaskStatusUpdateEvent(
+                    id=request.params.id, status=response.result.status, final=True))
+            return events()
+
+    class Manager(PipelineTaskManager, ReplyingAgent):
+        pass
+
+    def params(task_id, text):
+        return TaskSendParams(id=task_id, message=Message(role="user", parts=[TextPart(text=text)]))
+
+    manager = Manager()
+    response = asyncio.run(manager.on_send_task(SendTaskRequest(id=1, params=params("task-1", "hi"))))
+    assert isinstance(response, SendTaskResponse) and response.result.status.state == TaskState.COMPLETED
+    assert response.result.artifacts[0].parts[0].text == "all good" and "task-1" in manager.tasks
+    try:
+        asyncio.run(manager.on_send_task(SendTaskRequest(id=2, params=params("task-2", "<b>x</b>"))))
+        raise AssertionError("unsafe request accepted")
+    except SecurityRejected as e:
+        assert e.verdict.check == "input_validation" and e.verdict.part_index == 0
+    assert "task-2" not in manager.tasks
+
+    # A rejected result is not left behind for tasks/get.
+    manager.reply = "how to exploit it"
+    try:
+        asyncio.run(manager.on_send_task(SendTaskRequest(id=3, params=params("task-3", "hi"))))
+        raise AssertionError("forbidden artifact returned")
+    except SecurityRejected as e:
+        assert e.verdict.check == "output_verification" and e.verdict.detail.term == "exploit"
+    assert "task-3" not in manager.tasks
+
+    async def drain(task_id):
+        request = SendTaskStreamingRequest(id=4, params=params(task_id, "hi"))
+        return [event.result async for event in await manager.on_send_task_subscribe(request)]
+    manager.reply = "all good"
+    events = asyncio.run(drain("task-4"))
+    assert [type(e) for e in events] == [TaskArtifactUpdateEvent, TaskArtifactUpdateEvent, TaskStatusUpdateEvent]
+    manager.reply = "an exploit"  # split across the two chunks as "an e" + "xploit"
+    try:
+        asyncio.run(drain("task-5"))
+        raise AssertionError("forbidden stream passed")
+    except SecurityRejected as e:
+        assert e.verdict.check == "output_verification"
+    assert "task-4" in manager.tasks and "task-5" not in manager.tasks
+
+
+if __name__ == "__main__":
+    test_security_pipeline()
+    test_pipeline_task_manager()
+    print("Security pipeline ran successfully.")
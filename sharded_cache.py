@@ -0,0 +1,132 @@
+"""
+Lock-striped cache for threaded A2A servers with heavy concurrent access.
+Mitigates: DoS (lock contention), Artifact Tampering
+MAESTRO Layers: 3 (Agent Frameworks), 4 (Deployment & Infrastructure)
+
+``InMemoryCache`` serializes every operation on one lock. ``ShardedCache``
+splits the key space over ``shards`` dicts, each with its own lock, so writers
+only contend when their keys hash to the same shard. Entries are immutable
+``(value, expires)`` tuples and a single dict lookup is atomic, so ``get``
+takes no lock at all; a lock is only taken to drop an expired entry.
+``set_many`` takes each shard's lock once per call; ``get_many`` none.
+"""
+import time
+from threading import Lock
+
+
+class _Shard:
+    __slots__ = ("data", "lock")
+
+    def __init__(self):
+        self.data = {}  # key -> (value, expires or None)
+        self.lock = Lock()
+
+
+class ShardedCache:
+    """Thread-safe cache with the ``InMemoryCache`` interface plus bulk operations."""
+
+    def __init__(self, shards: int = 16, max_entries_per_shard: int = None, default_ttl: float = None,
+                 clock=time.monotonic):
+        if shards & (shards - 1):
+            raise ValueError("shards must be a power of two")
+        self._shards = [_Shard() for _ in range(shards)]
+        self._mask = shards - 1
+        self.max_entries_per_shard = max_entries_per_shard
+        self.default_ttl = default_ttl
+        self._clock = clock
+
+    def _shard(self, key) -> _Shard:
+        return self._shards[hash(key) & self._mask]
+
+    def get(self, key, default=None):
+        shard = self._shard(key)
+        entry = shard.data.get(key)
+        if entry is None:
+            return default
+        if entry[1] is not None and self._clock() >= entry[1]:
+            with shard.lock:
+                if shard.data.get(key) is entry:  # not replaced meanwhile
+                    del shard.data[key]
+            return default
+        return entry[0]
+
+    def set(self, key, value, ttl: float = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        entry = (value, self._clock() + ttl if ttl is not None else None)
+        shard = self._shard(key)
+        with shard.lock:
+            self._store(shard, key, entry)
+
+    def _store(self, shard, key, entry):
+        data = shard.data
+        data[key] = entry  # replaced in place, so lock-free readers never see a gap
+        if self.max_entries_per_shard is not None and len(data) > self.max_entries_per_shard:
+            del data[next(iter(data))]  # oldest key first
+
+    def delete(self, key) -> bool:
+        shard = self._shard(key)
+        with shard.lock:
+            return shard.data.pop(key, None) is not None
+
+    def clear(self) -> bool:
+        for shard in self._shards:
+            with shard.lock:
+                shard.data.clear()
+        return True
+
+    def get_many(self, keys, default=None) -> dict:
+        """Return ``{key: value}`` for the given keys (``default`` for misses)."""
+        get = self.get
+        return {key: get(key, default) for key in keys}
+
+    def set_many(self, items, ttl: float = None):
+        """Store a mapping or iterable of ``(key, value)`` pairs, locking each shard once."""
+        ttl = self.default_ttl if ttl is None else ttl
+        expires = self._clock() + ttl if ttl is not None else None
+        by_shard = {}
+        for key, value in (items.items() if hasattr(items, "items") else items):
+            by_shard.setdefault(hash(key) & self._mask, []).append((key, (value, expires)))
+        for index, entries in by_shard.items():
+            shard = self._shards[index]
+            with shard.lock:
+                for key, entry in entries:
+                    self._store(shard, key, entry)
+
+    def __len__(self):
+        return sum(len(shard.data) for shard in self._shards)
+
+
+def test_sharded_cache():
+    import threading
+    now = [0.0]
+    cache = ShardedCache(shards=4, max_entries_per_shard=100, clock=lambda: now[0])
+    cache.set("artifact", "value")
+    assert cache.get("artifact") == "value"
+    assert cache.delete("artifact") and cache.get("artifact") is None
+    cache.set_many({f"k{i}": i for i in range(50)}, ttl=5)
+    assert cache.get_many(["k1", "k49", "missing"]) == {"k1": 1, "k49": 49, "missing": None}
+    now[0] = 5.0
+    assert cache.get("k1") is None and len(cache) == 49
+    try:
+        ShardedCache(shards=3)
+        raise AssertionError("non power-of-two shard count accepted")
+    except ValueError:
+        pass
+
+    cache = ShardedCache(shards=8, max_entries_per_shard=64)
+    def hammer(worker):
+        for i in range(2000):
+            cache.set(f"w{worker}:{i % 200}", i)
+            cache.set("hot", worker)
+            cache.get("hot")
+    threads = [threading.Thread(target=hammer, args=(w,)) for w in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cache.get("hot") in range(5) and len(cache) <= 8 * 64
+
+
+if __name__ == "__main__":
+    test_sharded_cache()
+    print("Sharded cache ran successfully.")
@@ -0,0 +1,200 @@
+"""
+Single-flight get-or-compute over the artifact caches.
+Mitigates: DoS (thundering-herd recomputation), Artifact Tampering
+MAESTRO Layers: 3 (Agent Frameworks), 4 (Deployment & Infrastructure)
+
+When a popular entry is missing or has expired, every concurrent request
+would recompute it, and the computation may be an LLM-backed agent call.
+``SingleFlight`` lets the first caller compute while the others wait for its
+result (or its exception) for at most ``timeout`` seconds. Failures are not
+cached. With ``refresh_ahead`` and a cache that reports ``ttl_remaining``
+(``BoundedCache``), an entry that is about to expire is recomputed in the
+background while callers keep getting the current value, so hot keys do not
+miss. Works with ``InMemoryCache``, ``BoundedCache`` and ``ShardedCache``.
+"""
+import asyncio
+import threading
+
+_MISSING = object()
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = self.error = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent computations per key, for threads and for asyncio."""
+
+    def __init__(self, cache, refresh_ahead: float = None):
+        self.cache = cache
+        self.refresh_ahead = refresh_ahead
+        self._calls = {}  # key -> _Call (threads)
+        self._tasks = {}  # key -> asyncio.Task
+        self._lock = threading.Lock()
+        self.computations = 0
+
+    def _expiring(self, key) -> bool:
+        if self.refresh_ahead is None:
+            return False
+        ttl_remaining = getattr(self.cache, "ttl_remaining", None)
+        remaining = ttl_remaining(key) if ttl_remaining else None
+        return remaining is not None and remaining <= self.refresh_ahead
+
+    def get_or_compute(self, key, compute, ttl: float = None, timeout: float = None):
+        """Return the cached value or ``compute()`` it once for all concurrent callers.
+
+        Raises ``TimeoutError`` if the shared computation takes longer than
+        ``timeout``; an exception raised by ``compute`` is raised to every caller.
+        """
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            if self._expiring(key):
+                call, leader = self._join(key)
+                if leader:
+                    threading.Thread(target=self._run, args=(key, call, compute, ttl), daemon=True).start()
+            return value
+        call, leader = self._join(key)
+        if leader:
+            self._run(key, call, compute, ttl)
+        elif not call.done.wait(timeout):
+            raise TimeoutError(f"Timed out waiting for {key!r} to be computed")
+        if call.error is not None:
+            raise call.error
+        return call.value
+
+    def _join(self, key):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = self._calls[key] = _Call()
+            return call, True
+
+    def _run(self, key, call, compute, ttl):
+        try:
+            self.computations += 1
+            call.value = compute()
+            self.cache.set(key, call.value, ttl)
+        except BaseException as e:
+            call.error = e
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def aget_or_compute(self, key, compute, ttl: float = None, timeout: float = None):
+        """Async variant: ``compute`` is a coroutine function.
+
+        The computation runs as its own task, so a caller that times out or is
+        cancelled does not cancel it for the others.
+        """
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            if self._expiring(key) and key not in self._tasks:
+                self._start_task(key, compute, ttl)
+            return value
+        task = self._tasks.get(key) or self._start_task(key, compute, ttl)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Timed out waiting for {key!r} to be computed") from None
+
+    def _start_task(self, key, compute, ttl):
+        async def run():
+            self.computations += 1
+            value = await compute()
+            self.cache.set(key, value, ttl)
+            return value
+
+        def finished(task):
+            self._tasks.pop(key, None)
+            if not task.cancelled():
+                task.exception()  # a failed background refresh is not an unhandled error
+
+        task = self._tasks[key] = asyncio.ensure_future(run())
+        task.add_done_callback(finished)
+        return task
+
+
+def test_single_flight():
+    import time
+    from bounded_cache import BoundedCache
+
+    now = [0.0]
+    cache = BoundedCache(clock=lambda: now[0])
+    flight = SingleFlight(cache, refresh_ahead=5)
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"result": len(calls)}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.get_or_compute("artifact", slow, ttl=60)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1 and results == [{"result": 1}] * 8
+
+    def failing():
+        raise RuntimeError("agent call failed")
+
+    try:
+        flight.get_or_compute("broken", failing)
+        raise AssertionError("error not propagated")
+    except RuntimeError:
+        assert cache.get("broken") is None  # failures are not cached
+    try:
+        threading.Thread(target=flight.get_or_compute, args=("slow", slow)).start()
+        time.sleep(0.01)
+        flight.get_or_compute("slow", slow, timeout=0.001)
+        raise AssertionError("timeout not raised")
+    except TimeoutError:
+        pass
+
+    # Refresh-ahead: within 5s of expiry the old value is served while it is recomputed.
+    now[0] = 56.0
+    assert flight.get_or_compute("artifact", slow, ttl=60) == {"result": 1}
+    time.sleep(0.2)
+    assert cache.get("artifact")["result"] > 1 and cache.ttl_remaining("artifact") == 60
+
+    async def run():
+        computed = []
+
+        async def fetch():
+            computed.append(1)
+            await asyncio.sleep(0.02)
+            return "card"
+
+        values = await asyncio.gather(*(flight.aget_or_compute("async", fetch, ttl=60) for _ in range(10)))
+        assert values == ["card"] * 10 and computed == [1]
+
+        async def hang():
+            await asyncio.sleep(1)
+
+        try:
+            await flight.aget_or_compute("hang", hang, timeout=0.01)
+            raise AssertionError("timeout not raised")
+        except TimeoutError:
+            pass
+
+        async def boom():
+            raise RuntimeError("agent call failed")
+
+        results = await asyncio.gather(*(flight.aget_or_compute("boom", boom) for _ in range(3)),
+                                       return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_single_flight()
+    print("Single flight ran successfully.")
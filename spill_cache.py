@@ -0,0 +1,309 @@
+"""
+Two-tier artifact cache that spills large entries to memory-mapped segments.
+Mitigates: Artifact Tampering, DoS (heap growth and GC pauses)
+MAESTRO Layers: 3 (Agent Frameworks), 4 (Deployment & Infrastructure), 6 (Security & Compliance)
+
+Small entries stay in an in-memory ``BoundedCache``. Entries of at least
+``threshold`` bytes are written once into append-only mmap segment files and
+only a small index entry stays on the heap, so large artifacts neither bloat
+the heap nor get walked by the garbage collector. Bytes-like values are read
+back zero-copy as read-only ``memoryview``s. Pydantic models (e.g.
+``Artifact``) are stored as their JSON and restored as the same model class.
+Other values spill only if they are made of exact JSON types (``dict`` with
+``str`` keys, ``list``, ``str``, ``int``, ``float``, ``bool``, ``None``), so
+they read back equal; anything else, such as tuples or non-string keys, stays
+on the heap.
+
+Every spilled record carries an HMAC-SHA256 over its cache key, kind and
+payload under a per-cache secret, checked on every read of a spilled entry
+(an HMAC pass over the whole payload, roughly 200 us per 256 KiB). A record
+that was modified on disk, or swapped in from another key, fails
+verification and raises ``SpillTamperError``. Segments whose records are all dead are unlinked; past
+``max_spill_bytes`` the oldest segment is dropped with its entries.
+
+Without a ``directory`` the cache creates a private temporary one and owns
+it: ``close()`` removes it, and so does garbage collection or interpreter
+exit if ``close()`` is never called.
+"""
+import hashlib
+import hmac
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from threading import Lock
+
+from pydantic import BaseModel
+
+from bounded_cache import BoundedCache, approx_size
+
+_RECORD = struct.Struct("<IB3x32s")  # payload length, kind, HMAC-SHA256
+RAW, JSON, MODEL = 0, 1, 2
+_MISSING = object()
+
+
+def _json_native(value) -> bool:
+    """True if ``value`` reads back from JSON equal and with the same types."""
+    kind = type(value)
+    if kind is str or kind is int or kind is float or kind is bool or value is None:
+        return True
+    if kind is list:
+        return all(_json_native(v) for v in value)
+    if kind is dict:
+        return all(type(k) is str and _json_native(v) for k, v in value.items())
+    return False
+
+
+class SpillTamperError(ValueError):
+    """A spilled record failed HMAC verification."""
+
+
+class _Segment:
+    def __init__(self, directory: str, size: int):
+        fd, path = tempfile.mkstemp(prefix="segment-", suffix=".spill", dir=directory)  # mode 0600
+        try:
+            os.ftruncate(fd, size)
+            self.mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self.path = path
+        self.size = size
+        self.used = 0
+        self.keys = set()  # live keys stored here
+
+    def close(self) -> bool:
+        try:
+            self.mm.close()
+        except BufferError:  # a caller still holds a memoryview into it
+            return False
+        os.unlink(self.path)
+        return True
+
+
+class SpillCache:
+    """``InMemoryCache``-style cache whose large entries live in mmap segments."""
+
+    def __init__(self, directory: str = None, threshold: int = 64 * 1024, segment_size: int = 64 * 1024 * 1024,
+                 max_spill_bytes: int = 1024 * 1024 * 1024, default_ttl: float = None,
+                 memory: BoundedCache = None, secret: bytes = None, clock=time.monotonic):
+        self._tempdir = None if directory else tempfile.TemporaryDirectory(prefix="a2a-spill-")
+        self.directory = directory or self._tempdir.name
+        self.threshold = threshold
+        self.segment_size = segment_size
+        self.max_spill_bytes = max_spill_bytes
+        self.default_ttl = default_ttl
+        self.memory = memory if memory is not None else BoundedCache(default_ttl=default_ttl, clock=clock)
+        self._secret = secret or os.urandom(32)
+        self._clock = clock
+        self._index = {}  # key -> (segment, offset, length, kind, expires or None, model class or None)
+        self._segments = []  # oldest first; the last one is appended to
+        self._retired = []  # closed lazily once no memoryview refers to them
+        self._spilled_bytes = 0
+        self._lock = Lock()
+        self.spills = self.spill_hits = 0
+
+    def _mac(self, key, kind: int, payload) -> bytes:
+        mac = hmac.new(self._secret, repr(key).encode(), hashlib.sha256)
+        mac.update(bytes((kind,)))
+        mac.update(payload)
+        return mac.digest()
+
+    def set(self, key, value, ttl: float = None):
+        model = None
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            kind, payload = RAW, value
+        elif isinstance(value, BaseModel):
+            kind, payload, model = MODEL, value.model_dump_json().encode(), type(value)
+        elif approx_size(value) >= self.threshold and _json_native(value):
+            kind, payload = JSON, json.dumps(value, separators=(",", ":")).encode()
+        else:
+            kind, payload = None, None  # small, or would not read back the same: keep it on the heap
+        if payload is None or len(payload) < self.threshold:
+            with self._lock:
+                self._drop(key)
+            self.memory.set(key, value, ttl)
+            return
+        self.memory.delete(key)
+        ttl = self.default_ttl if ttl is None else ttl
+        expires = self._clock() + ttl if ttl is not None else None
+        header = _RECORD.pack(len(payload), kind, self._mac(key, kind, payload))
+        with self._lock:
+            self._drop(key)
+            segment = self._segment_for(_RECORD.size + len(payload))
+            offset = segment.used
+            start = offset + _RECORD.size
+            segment.mm[offset:start] = header
+            segment.mm[start:start + len(payload)] = payload
+            segment.used = start + len(payload)
+            segment.keys.add(key)
+            self._index[key] = (segment, offset, len(payload), kind, expires, model)
+            self.spills += 1
+
+    def get(self, key, default=None):
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        entry = self._index.get(key)
+        if entry is None:
+            return default
+        segment, offset, length, kind, expires, model = entry
+        if expires is not None and self._clock() >= expires:
+            self.delete(key)
+            return default
+        try:
+            stored_length, stored_kind, mac = _RECORD.unpack_from(segment.mm, offset)
+            start = offset + _RECORD.size
+            view = memoryview(segment.mm)[start:start + length].toreadonly()
+        except ValueError:  # segment closed by a concurrent delete
+            return default
+        if (stored_length, stored_kind) != (length, kind) or not hmac.compare_digest(mac, self._mac(key, kind, view)):
+            view.release()
+            self.delete(key)
+            raise SpillTamperError(f"Spilled artifact {key!r} failed integrity check")
+        self.spill_hits += 1
+        if kind == RAW:
+            return view
+        try:
+            return model.model_validate_json(bytes(view)) if kind == MODEL else json.loads(bytes(view))
+        finally:
+            view.release()
+
+    def ttl_remaining(self, key):
+        if key in self._index:
+            expires = self._index[key][4]
+            return None if expires is None else max(expires - self._clock(), 0.0)
+        return self.memory.ttl_remaining(key)
+
+    def delete(self, key) -> bool:
+        with self._lock:
+            spilled = self._drop(key)
+        return self.memory.delete(key) or spilled
+
+    def clear(self) -> bool:
+        with self._lock:
+            for key in list(self._index):
+                self._drop(key)
+        return self.memory.clear()
+
+    def _drop(self, key) -> bool:
+        entry = self._index.pop(key, None)
+        if entry is None:
+            return False
+        segment = entry[0]
+        segment.keys.discard(key)
+        if not segment.keys and segment is not self._segments[-1]:
+            self._retire(segment)
+        return True
+
+    def _segment_for(self, need: int) -> _Segment:
+        if self._segments and self._segments[-1].size - self._segments[-1].used >= need:
+            return self._segments[-1]
+        if self._segments and not self._segments[-1].keys:
+            self._retire(self._segments[-1])
+        size = max(self.segment_size, need)
+        while self._segments and self._spilled_bytes + size > self.max_spill_bytes:
+            oldest = self._segments[0]
+            for key in list(oldest.keys):
+                del self._index[key]
+            oldest.keys.clear()
+            self._retire(oldest)
+        segment = _Segment(self.directory, size)
+        self._segments.append(segment)
+        self._spilled_bytes += size
+        return segment
+
+    def _retire(self, segment: _Segment):
+        self._segments.remove(segment)
+        self._spilled_bytes -= segment.size
+        self._retired.append(segment)
+        self._retired = [s for s in self._retired if not s.close()]
+
+    def close(self):
+        """Drop every entry and delete the segment files, and the temporary directory if the cache made one."""
+        with self._lock:
+            self._index.clear()
+            for segment in self._segments + self._retired:
+                segment.keys.clear()
+                segment.close()  # one still mapped by a caller goes with the temporary directory
+            self._segments, self._retired = [], []
+            self._spilled_bytes = 0
+        self.memory.clear()
+        if self._tempdir is not None:
+            self._tempdir.cleanup()
+
+    def stats(self) -> dict:
+        stats = self.memory.stats()
+        stats.update(spilled_entries=len(self._index), spill_segments=len(self._segments),
+                     spill_bytes=self._spilled_bytes, spills=self.spills, spill_hits=self.spill_hits)
+        return stats
+
+
+def test_spill_cache():
+    import shutil
+    now = [0.0]
+    directory = tempfile.mkdtemp()
+    try:
+        cache = SpillCache(directory, threshold=1024, segment_size=64 * 1024, max_spill_bytes=128 * 1024,
+                           clock=lambda: now[0])
+        cache.set("artifact:small", {"result": "data"})
+        blob = os.urandom(10_000)
+        report = {"result": "x" * 5000, "parts": [1, 2, 3]}
+        cache.set("artifact:blob", blob, ttl=10)
+        cache.set("artifact:report", report)
+        assert cache.get("artifact:small") == {"result": "data"}
+        view = cache.get("artifact:blob")
+        assert isinstance(view, memoryview) and view.readonly and view == blob
+        view.release()
+        assert cache.get("artifact:report") == report
+        assert cache.stats()["spilled_entries"] == 2 and len(cache.memory) == 1
+        # Overwriting with a small value moves the entry back to memory.
+        cache.set("artifact:report", {"result": "short"})
+        assert cache.get("artifact:report") == {"result": "short"} and cache.stats()["spilled_entries"] == 1
+        # Expiry.
+        now[0] = 10.0
+        assert cache.get("artifact:blob") is None and cache.ttl_remaining("artifact:blob") is None
+        # Tampering with the segment file is detected.
+        cache.set("artifact:signed", blob)
+        segment, offset = cache._index["artifact:signed"][:2]
+        segment.mm[offset + _RECORD.size + 100] ^= 0xFF
+        try:
+            cache.get("artifact:signed")
+            raise AssertionError("tampered artifact returned")
+        except SpillTamperError:
+            assert cache.get("artifact:signed") is None
+        # Past max_spill_bytes the oldest segments are dropped.
+        for i in range(30):
+            cache.set(f"bulk:{i}", os.urandom(20_000))
+        stats = cache.stats()
+        assert stats["spill_bytes"] <= 128 * 1024 and cache.get("bulk:29") == cache.get("bulk:29")
+        assert cache.get("bulk:0") is None
+        assert cache.delete("bulk:29") and cache.clear()
+        assert len(os.listdir(directory)) <= 1
+        # Values come back as they went in: models as models, and anything JSON would
+        # alter (tuples, non-string keys) is kept on the heap.
+        from common.types import Artifact, TextPart
+        artifact = Artifact(name="big", parts=[TextPart(text="x" * 5000)])
+        cache.set("artifact:model", artifact)
+        assert "artifact:model" in cache._index and cache.get("artifact:model") == artifact
+        odd = {1: ("x" * 2000,)}
+        cache.set("artifact:odd", odd)
+        assert "artifact:odd" not in cache._index and cache.get("artifact:odd") == odd
+        cache.set("bulk:last", os.urandom(20_000))
+        cache.close()
+        assert os.listdir(directory) == [] and cache.get("bulk:last") is None
+    finally:
+        shutil.rmtree(directory)
+
+    # Without a directory, the cache's own temporary directory goes away on close.
+    owned = SpillCache(threshold=1024)
+    owned.set("artifact:blob", os.urandom(10_000))
+    assert os.listdir(owned.directory)
+    owned.close()
+    assert not os.path.exists(owned.directory)
+
+
+if __name__ == "__main__":
+    test_spill_cache()
+    print("Spill cache ran successfully.")
@@ -0,0 +1,137 @@
+"""
+Content-hash memoization of validation verdicts across A2A conversation turns.
+Mitigates: DoS (repeated validation work), Prompt Injection, Data Leakage
+MAESTRO Layers: 2 (Data Operations), 4 (Deployment & Infrastructure)
+
+Every turn of a conversation resends the earlier history, so the same parts
+are checked again and again. ``VerdictCache`` remembers the verdict of a
+check per ``(policy, content digest)``, where the policy is the object doing
+the check (a ``ForbiddenTermIndex``, an ``UnsafePatternScanner``). A verdict
+is only reused while the policy's ``version`` attribute is unchanged:
+reloading the forbidden terms or the unsafe patterns bumps it, and that
+policy's entries are dropped. Checks that cost less than hashing their input,
+such as schema validation of an in-memory model, gain nothing from it.
+"""
+import hashlib
+import sys
+from collections import OrderedDict
+from threading import Lock
+
+from metrics import METRICS
+
+
+def content_digest(content) -> bytes:
+    """Fast 128-bit digest of a part's content (``str`` or bytes-like)."""
+    if isinstance(content, str):
+        content = content.encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+class VerdictCache:
+    """LRU cache of check verdicts, bounded by entry count and approximate bytes."""
+
+    def __init__(self, max_entries: int = 100_000, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (policy, digest) -> (verdict, size)
+        # id(policy) -> (policy, version the cached verdicts were computed with);
+        # holding the policy keeps its id from being reused.
+        self._versions = {}
+        self._bytes = 0
+        self._lock = Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def check(self, policy, content, fn):
+        """Return ``fn(content)``, reusing the cached verdict for identical content.
+
+        ``fn`` must return the verdict rather than raise, e.g. a bool or a
+        ``TermMatch``/``None``, so the result can be replayed.
+        """
+        version = getattr(policy, "version", 0)
+        key = (id(policy), content_digest(content))
+        with self._lock:
+            known = self._versions.get(key[0])
+            if known is not None and known[1] != version:
+                self._invalidate(key[0])
+            self._versions[key[0]] = (policy, version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        verdict = fn(content)
+        size = sys.getsizeof(key[1]) + sys.getsizeof(verdict) + 64
+        with self._lock:
+            # The policy may have been reloaded while fn ran; don't cache a stale verdict.
+            if self._versions.get(key[0], (None, None))[1] == version and key not in self._entries:
+                self._entries[key] = (verdict, size)
+                self._bytes += size
+                self._evict()
+        return verdict
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def _invalidate(self, policy_id):
+        stale = [key for key in self._entries if key[0] == policy_id]
+        for key in stale:
+            self._bytes -= self._entries.pop(key)[1]
+        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# One cache shared by input validation and output verification.
+shared_verdicts = VerdictCache()
+METRICS.track_cache("verdicts", shared_verdicts)
+
+
+def test_verdict_cache():
+    from types import SimpleNamespace as Policy
+    calls = []
+
+    def unsafe(text):
+        calls.append(text)
+        return "<" in text
+
+    patterns, terms = Policy(version=0), Policy(version=0)
+    cache = VerdictCache(max_entries=2)
+    assert cache.check(patterns, "hello", unsafe) is False
+    assert cache.check(patterns, "hello", unsafe) is False
+    assert cache.check(patterns, "<b>", unsafe) is True
+    assert calls == ["hello", "<b>"]
+    # A new policy version drops that policy's verdicts.
+    patterns.version = 1
+    cache.check(patterns, "hello", unsafe)
+    assert calls == ["hello", "<b>", "hello"] and cache.invalidations == 1
+    cache.check(terms, "x", unsafe)
+    cache.check(terms, "y", unsafe)
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert stats["hits"] == 1 and stats["misses"] == 5
+
+
+if __name__ == "__main__":
+    test_verdict_cache()
+    print("Verdict cache ran successfully.")